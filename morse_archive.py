@@ -0,0 +1,241 @@
+import bisect
+import json
+import os
+import tempfile
+import unittest
+import uuid
+import zipfile
+from datetime import datetime
+
+# --- Constants ---
+ARCHIVE_EXTENSION = ".morz"
+SCROLL_EXTENSION = ".mor"
+SCROLL_FOLDER = "scrolls/"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+UNSAFE_ID_CHARACTERS = set('/\\:\0')
+
+
+def valid_scroll_id(scroll_id):
+    """True if ``scroll_id`` can name one file inside an export folder"""
+    return (isinstance(scroll_id, str) and scroll_id not in ('', '.', '..')
+            and not UNSAFE_ID_CHARACTERS.intersection(scroll_id))
+
+
+# --- Scroll Archive ---
+class ScrollArchive:
+    """Many oracle scrolls in one zip file, indexed by id, timestamp and mode
+
+    Each scroll is stored as ``scrolls/<id>.mor`` with the same JSON as a
+    standalone .mor file. Its mode and timestamp also ride in the zip
+    entry's comment, so opening an archive builds the whole index from
+    the central directory alone; no scroll is read until asked for.
+    Lookups are dict hits and reads seek straight to the entry. Scrolls
+    are only ever appended; each add writes just the new entry, but
+    closing an archive opened for appending rewrites the central
+    directory, so that costs time in proportion to the number of scrolls.
+    Batch many adds into one open archive.
+
+    Entry names that are not valid scroll ids (path separators, ``..``)
+    and repeated names are ignored, so a crafted archive cannot make
+    ``export_scrolls`` write outside its folder.
+    """
+    def __init__(self, path, mode='a'):
+        if mode not in ('r', 'a'):
+            raise ValueError("ScrollArchive mode must be 'r' or 'a'")
+        self.path = os.fspath(path)
+        self._zip = zipfile.ZipFile(self.path, mode, compression=zipfile.ZIP_DEFLATED)
+        self._entries = {}  # id -> ZipInfo
+        self._modes = {}  # id -> mode
+        self._by_mode = {}  # mode -> [id, ...] in archive order
+        self._by_time = []  # sorted (timestamp, archive position, id)
+        for info in self._zip.infolist():
+            if info.filename.startswith(SCROLL_FOLDER) and info.filename.endswith(SCROLL_EXTENSION):
+                self._index(info, sort=False)
+        self._by_time.sort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, scroll_id):
+        return scroll_id in self._entries
+
+    def __iter__(self):
+        return self.iter_scrolls()
+
+    def close(self):
+        self._zip.close()
+
+    def _index(self, info, sort=True):
+        scroll_id = info.filename[len(SCROLL_FOLDER):-len(SCROLL_EXTENSION)]
+        if not valid_scroll_id(scroll_id) or scroll_id in self._entries:
+            return
+        try:
+            meta = json.loads(info.comment or b'{}')
+        except ValueError:
+            meta = {}
+        if not isinstance(meta, dict):  # foreign comments may be any JSON
+            meta = {}
+        timestamp, mode = meta.get("timestamp"), meta.get("mode")
+        key = (timestamp if isinstance(timestamp, str) else "", len(self._entries), scroll_id)
+        mode = mode if isinstance(mode, str) else None
+        self._entries[scroll_id] = info
+        self._modes[scroll_id] = mode
+        self._by_mode.setdefault(mode, []).append(scroll_id)
+        if not sort or not self._by_time or key > self._by_time[-1]:
+            self._by_time.append(key)  # scrolls normally arrive in time order
+        else:
+            bisect.insort(self._by_time, key)
+
+    def add(self, data, scroll_id=None):
+        """Append a scroll (a .mor-style dict) and return its id"""
+        scroll_id = scroll_id or uuid.uuid4().hex
+        if not valid_scroll_id(scroll_id):
+            raise ValueError(f"Invalid scroll id: {scroll_id!r}")
+        if scroll_id in self._entries:
+            raise ValueError(f"Scroll already archived: {scroll_id}")
+        data = dict(data)
+        data.setdefault("timestamp", datetime.now().strftime(TIMESTAMP_FORMAT))
+
+        info = zipfile.ZipInfo(f"{SCROLL_FOLDER}{scroll_id}{SCROLL_EXTENSION}",
+                               date_time=datetime.now().timetuple()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.comment = json.dumps(
+            {"mode": data.get("mode"), "timestamp": data["timestamp"]}
+        ).encode('utf-8')
+        self._zip.writestr(info, json.dumps(data, indent=2))
+        self._index(info)
+        return scroll_id
+
+    def get(self, scroll_id):
+        """Read one scroll by id"""
+        try:
+            info = self._entries[scroll_id]
+        except KeyError:
+            raise KeyError(f"No scroll with id {scroll_id!r}") from None
+        return json.loads(self._zip.read(info))
+
+    def ids(self, mode=None, start=None, end=None):
+        """Scroll ids filtered by mode and/or timestamp range [start, end)"""
+        if start is None and end is None:
+            return list(self._by_mode.get(mode, [])) if mode else list(self._entries)
+        low = bisect.bisect_left(self._by_time, (start or "",))
+        high = bisect.bisect_left(self._by_time, (end,)) if end else len(self._by_time)
+        return [scroll_id for _, _, scroll_id in self._by_time[low:high]
+                if mode is None or self._modes[scroll_id] == mode]
+
+    def iter_scrolls(self, mode=None, start=None, end=None):
+        """Stream (id, scroll) pairs, reading one scroll at a time"""
+        for scroll_id in self.ids(mode, start, end):
+            yield scroll_id, self.get(scroll_id)
+
+    def import_scrolls(self, paths):
+        """Append existing .mor files (paths or a folder); returns the new ids"""
+        if isinstance(paths, (str, os.PathLike)) and os.path.isdir(paths):
+            folder = paths
+            paths = sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                           if name.endswith(SCROLL_EXTENSION))
+        added = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            name = os.path.splitext(os.path.basename(path))[0]
+            usable = valid_scroll_id(name) and name not in self._entries
+            added.append(self.add(data, name if usable else None))
+        return added
+
+    def export_scrolls(self, folder, ids=None):
+        """Write scrolls back out as individual .mor files; returns their paths"""
+        os.makedirs(folder, exist_ok=True)
+        written = []
+        for scroll_id in (self.ids() if ids is None else ids):
+            path = os.path.join(folder, f"{scroll_id}{SCROLL_EXTENSION}")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.get(scroll_id), f, indent=2)
+            written.append(path)
+        return written
+
+
+# --- Unit Tests ---
+class TestScrollArchive(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "oracle" + ARCHIVE_EXTENSION)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def _scroll(self, i, mode="encode"):
+        return {"input": f"SCROLL {i}", "output": f"... {i}", "mode": mode,
+                "timestamp": f"2024-01-{i + 1:02d} 12:00:00", "version": "1.0.0"}
+
+    def test_add_and_get(self):
+        with ScrollArchive(self.path) as archive:
+            scroll_id = archive.add(self._scroll(0))
+            self.assertEqual(archive.get(scroll_id)["input"], "SCROLL 0")
+            with self.assertRaises(ValueError):
+                archive.add(self._scroll(1), scroll_id)
+            with self.assertRaises(KeyError):
+                archive.get("missing")
+
+    def test_index_survives_reopen_and_appends(self):
+        with ScrollArchive(self.path) as archive:
+            for i in range(6):
+                archive.add(self._scroll(i, "encode" if i % 2 else "decode"), f"s{i}")
+        with ScrollArchive(self.path) as archive:
+            archive.add(self._scroll(9), "s9")
+        with ScrollArchive(self.path, 'r') as archive:
+            self.assertEqual(len(archive), 7)
+            self.assertEqual(archive.ids(mode="decode"), ["s0", "s2", "s4"])
+            self.assertEqual(archive.ids(start="2024-01-02", end="2024-01-04"), ["s1", "s2"])
+            self.assertEqual(archive.ids(mode="encode", start="2024-01-04"), ["s3", "s5", "s9"])
+            self.assertEqual([s["input"] for _, s in archive.iter_scrolls(mode="decode")],
+                             ["SCROLL 0", "SCROLL 2", "SCROLL 4"])
+
+    def test_unsafe_and_duplicate_entries_ignored(self):
+        with zipfile.ZipFile(self.path, 'w') as z:
+            z.writestr(f"{SCROLL_FOLDER}../../escape{SCROLL_EXTENSION}", json.dumps(self._scroll(0)))
+            z.writestr(f"{SCROLL_FOLDER}..{SCROLL_EXTENSION}", json.dumps(self._scroll(1)))
+            z.writestr(f"{SCROLL_FOLDER}s2{SCROLL_EXTENSION}", json.dumps(self._scroll(2)))
+            with self.assertWarns(UserWarning):  # zipfile warns about the repeated name
+                z.writestr(f"{SCROLL_FOLDER}s2{SCROLL_EXTENSION}", json.dumps(self._scroll(3)))
+        out = os.path.join(self.folder.name, "deep", "out")
+        with ScrollArchive(self.path) as archive:
+            self.assertEqual((archive.ids(), len(archive._by_time)), (["s2"], 1))
+            self.assertEqual(archive.export_scrolls(out), [os.path.join(out, "s2.mor")])
+            for bad in ("../x", "a/b", "a\\b", "..", "C:x"):
+                with self.assertRaises(ValueError):
+                    archive.add(self._scroll(4), bad)
+        self.assertFalse(os.path.exists(os.path.join(self.folder.name, "escape.mor")))
+
+    def test_foreign_entry_comments_ignored(self):
+        with zipfile.ZipFile(self.path, 'w') as z:
+            for n, comment in enumerate((b'[1]', b'"text"', b'{"timestamp": 5, "mode": ["x"]}', b'{bad')):
+                info = zipfile.ZipInfo(f"{SCROLL_FOLDER}s{n}{SCROLL_EXTENSION}")
+                info.comment = comment
+                z.writestr(info, json.dumps(self._scroll(n)))
+        with ScrollArchive(self.path) as archive:
+            self.assertEqual(sorted(archive.ids()), ["s0", "s1", "s2", "s3"])
+            self.assertEqual(archive.ids(start="2000"), [])
+            self.assertEqual(archive.get("s0"), self._scroll(0))
+
+    def test_import_and_export_mor_files(self):
+        source = os.path.join(self.folder.name, "scrolls")
+        os.makedirs(source)
+        for i in range(3):
+            with open(os.path.join(source, f"prophecy{i}.mor"), 'w', encoding='utf-8') as f:
+                json.dump(self._scroll(i), f)
+        with ScrollArchive(self.path) as archive:
+            self.assertEqual(archive.import_scrolls(source), ["prophecy0", "prophecy1", "prophecy2"])
+            exported = archive.export_scrolls(os.path.join(self.folder.name, "out"))
+        with open(exported[1], encoding='utf-8') as f:
+            self.assertEqual(json.load(f), self._scroll(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
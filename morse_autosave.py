@@ -0,0 +1,372 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# --- Constants ---
+AUTOSAVE_FOLDER = Path.home() / ".ancient_morse_oracle" / "autosave"
+AUTOSAVE_INTERVAL = 2.0  # seconds between autosaves while editing
+SCROLL_SUFFIX = ".mor"
+LOCK_SUFFIX = ".lock"
+TEMP_SUFFIX = ".tmp"
+
+_DISCARD = object()
+
+
+# --- Atomic Writes ---
+def atomic_write_json(path, data):
+    """Write JSON so ``path`` holds either the old or the new scroll, never half of one
+
+    The data goes to a temp file beside ``path``, is fsynced, then renamed
+    over it; the directory is synced too so the rename survives a crash.
+    """
+    path = os.fspath(path)
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=TEMP_SUFFIX, dir=folder)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+# --- Ownership Locks ---
+def try_lock(path):
+    """Open ``path`` and lock it exclusively without waiting
+
+    Returns the open file (the lock lasts until it is closed), or None if
+    another window holds it. The OS drops the lock when its owner dies,
+    so a free lock means the owner is gone.
+    """
+    f = open(path, 'a+b')
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# --- Background Autosave ---
+class ScrollAutosaver:
+    """Writes scroll snapshots atomically on a background thread
+
+    ``save`` only parks the snapshot and returns; if several arrive while
+    a write is in progress, only the newest is written. Callers decide how
+    often to snapshot (the GUI does so at most once per interval).
+
+    Every autosaver owns its own ``<id>.mor`` in ``folder`` and holds a
+    lock on ``<id>.lock`` while it lives, so several windows never touch
+    each other's files. Only autosaves whose lock is free, i.e. whose
+    window died without cleaning up, are offered by ``recover``.
+    """
+    def __init__(self, folder=AUTOSAVE_FOLDER):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.id = uuid.uuid4().hex
+        self.path = self.folder / f"{self.id}{SCROLL_SUFFIX}"
+        self._lock = try_lock(self.folder / f"{self.id}{LOCK_SUFFIX}")
+        self.writes = 0
+        self.last_error = None
+        self._pending = None
+        self._snapshots = 0  # snapshots handed to save so far
+        self._jobs = deque()  # explicit (path, data, future, snapshots) saves
+        self._busy = False
+        self._closed = False
+        self._recovered = None  # (id, lock file) of the orphan handed out by recover
+        self._orphans = self._claim_orphans()
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="oracle-autosave", daemon=True)
+        self._thread.start()
+
+    def _claim_orphans(self):
+        """Lock the files of autosavers that are gone; returns [(id, lock file)]
+
+        Their leftover temp files are removed on the way. Files of live
+        autosavers are left alone.
+        """
+        owners = set()
+        for entry in self.folder.iterdir():
+            name = entry.name
+            if name.endswith(TEMP_SUFFIX) and name.startswith('.'):
+                owners.add(name[1:].split('.', 1)[0])
+            elif name.endswith((SCROLL_SUFFIX, LOCK_SUFFIX)):
+                owners.add(entry.stem)
+        owners.discard(self.id)
+
+        orphans = []
+        for owner in sorted(owners):
+            lock = try_lock(self.folder / f"{owner}{LOCK_SUFFIX}")
+            if lock is None:
+                continue  # its window is still open
+            for stale in self.folder.glob(f".{owner}{SCROLL_SUFFIX}.*{TEMP_SUFFIX}"):
+                _remove(stale)
+            if (self.folder / f"{owner}{SCROLL_SUFFIX}").exists():
+                orphans.append((owner, lock))
+            else:
+                self._release(owner, lock, delete=True)
+        return orphans
+
+    def _release(self, owner, lock, delete):
+        """Unlock an orphan, deleting its autosave first when ``delete``"""
+        if delete:
+            _remove(self.folder / f"{owner}{SCROLL_SUFFIX}")
+        lock.close()
+        if delete:
+            _remove(self.folder / f"{owner}{LOCK_SUFFIX}")
+
+    def save(self, data):
+        """Queue a snapshot (a .mor-style dict) for writing; never blocks on I/O"""
+        with self._condition:
+            self._pending = data
+            self._snapshots += 1
+            self._condition.notify()
+
+    def save_as(self, path, data):
+        """Write a scroll to ``path`` on the writer thread; returns a Future
+
+        Once it is safely on disk the autosave it supersedes is dropped,
+        unless a newer snapshot has been queued since.
+        """
+        future = Future()
+        with self._condition:
+            self._jobs.append((path, data, future, self._snapshots))
+            self._condition.notify()
+        return future
+
+    def discard(self):
+        """Forget this window's autosave, e.g. after the scroll is saved for real"""
+        with self._condition:
+            self._pending = _DISCARD
+            self._condition.notify()
+
+    def recover(self):
+        """Return the newest autosaved scroll left by a window that is gone, if any
+
+        Other orphans are released untouched, for the next window to offer.
+        """
+        found = None
+        for owner, lock in sorted(self._orphans, reverse=True,
+                                  key=lambda o: (self.folder / f"{o[0]}{SCROLL_SUFFIX}").stat().st_mtime):
+            if found is not None:
+                self._release(owner, lock, delete=False)
+                continue
+            try:
+                with open(self.folder / f"{owner}{SCROLL_SUFFIX}", 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+            if isinstance(data, dict):
+                found = data
+                self._recovered = (owner, lock)
+            else:
+                self._release(owner, lock, delete=True)  # unreadable
+        self._orphans = []
+        return found
+
+    def drop_recovered(self):
+        """Delete the autosave returned by ``recover`` once it is restored or refused"""
+        if self._recovered:
+            self._release(*self._recovered, delete=True)
+            self._recovered = None
+
+    def flush(self, timeout=None):
+        """Wait until every queued snapshot and save is on disk"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._pending is None and not self._jobs and not self._busy, timeout)
+
+    def close(self, timeout=5.0):
+        """Finish pending writes, stop the thread and give up the lock"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        for owner, lock in self._orphans + ([self._recovered] if self._recovered else []):
+            self._release(owner, lock, delete=False)
+        self._orphans, self._recovered = [], None
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+            if not self.path.exists():
+                _remove(self.folder / f"{self.id}{LOCK_SUFFIX}")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._jobs or self._closed)
+                job = data = None
+                if self._jobs:
+                    job = self._jobs.popleft()
+                elif self._pending is not None:
+                    data, self._pending = self._pending, None
+                else:
+                    return
+                self._busy = True
+            try:
+                if job is not None:
+                    self._write_job(*job)
+                elif data is _DISCARD:
+                    try:
+                        self.path.unlink()
+                    except FileNotFoundError:
+                        pass
+                else:
+                    atomic_write_json(self.path, data)
+                    self.writes += 1
+                self.last_error = None
+            except Exception as e:  # keep the writer alive; the GUI reports last_error
+                self.last_error = e
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _write_job(self, path, data, future, snapshots):
+        try:
+            atomic_write_json(path, data)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        with self._condition:
+            superseded = self._snapshots == snapshots
+            if superseded:
+                self._pending = None  # any snapshot still queued predates the save
+        if superseded:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+        future.set_result(path)
+
+
+# --- Unit Tests ---
+class TestAutosave(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name) / "scroll.mor"
+        self.autosavers = []
+
+    def tearDown(self):
+        for autosaver in self.autosavers:
+            autosaver.close()
+        self.folder.cleanup()
+
+    def _autosaver(self):
+        autosaver = ScrollAutosaver(self.folder.name)
+        self.autosavers.append(autosaver)
+        return autosaver
+
+    def test_atomic_write_replaces_whole_file(self):
+        atomic_write_json(self.path, {"input": "OLD"})
+        atomic_write_json(self.path, {"input": "NEW"})
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {"input": "NEW"})
+        self.assertEqual(os.listdir(self.folder.name), ["scroll.mor"])
+
+    def test_failed_write_keeps_old_file(self):
+        atomic_write_json(self.path, {"input": "OLD"})
+        with self.assertRaises(TypeError):
+            atomic_write_json(self.path, {"input": object()})
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {"input": "OLD"})
+        self.assertEqual(os.listdir(self.folder.name), ["scroll.mor"])
+
+    def test_rapid_saves_coalesce(self):
+        autosaver = self._autosaver()
+        for i in range(500):
+            autosaver.save({"input": "x" * 10000, "version": i})
+        self.assertTrue(autosaver.flush(5.0))
+        self.assertLess(autosaver.writes, 500)
+        with open(autosaver.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["version"], 499)
+
+    def test_live_windows_leave_each_other_alone(self):
+        first = self._autosaver()
+        first.save({"input": "FIRST"})
+        first.flush(5.0)
+        in_flight = Path(self.folder.name) / f".{first.path.name}.abc{TEMP_SUFFIX}"
+        in_flight.write_text("{half")
+
+        second = self._autosaver()
+        self.assertIsNone(second.recover())
+        second.drop_recovered()
+        self.assertTrue(first.path.exists())
+        self.assertTrue(in_flight.exists())
+
+    def test_recovery_after_crash(self):
+        crashed = ScrollAutosaver(self.folder.name)
+        crashed.save({"input": "SOS"})
+        crashed.flush(5.0)
+        crashed.close()  # gone without discarding, as after a crash
+        stale = Path(self.folder.name) / f".{crashed.path.name}.abc{TEMP_SUFFIX}"
+        stale.write_text("{half")
+
+        survivor = self._autosaver()
+        self.assertFalse(stale.exists())
+        third = self._autosaver()
+        self.assertIsNone(third.recover())  # already claimed by the survivor
+        self.assertEqual(survivor.recover(), {"input": "SOS"})
+        survivor.drop_recovered()
+        self.assertFalse(crashed.path.exists())
+        self.assertIsNone(self._autosaver().recover())
+
+    def test_discard_and_clean_close_leave_nothing(self):
+        autosaver = ScrollAutosaver(self.folder.name)
+        autosaver.save({"input": "SOS"})
+        autosaver.discard()
+        autosaver.close()
+        self.assertEqual(os.listdir(self.folder.name), [])
+
+    def test_save_as_supersedes_autosave(self):
+        autosaver = self._autosaver()
+        autosaver.save({"input": "DRAFT"})
+        self.assertEqual(autosaver.save_as(self.path, {"input": "FINAL"}).result(5.0), self.path)
+        autosaver.flush(5.0)
+        self.assertFalse(autosaver.path.exists())
+
+        autosaver.save({"input": "DRAFT"})
+        autosaver.flush(5.0)
+        failed = autosaver.save_as(self.path, {"input": object()})
+        self.assertIsInstance(failed.exception(5.0), TypeError)
+        self.assertTrue(autosaver.path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
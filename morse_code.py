@@ -3,19 +3,30 @@ from tkinter import ttk, messagebox, filedialog, scrolledtext
 import numpy as np
 from datetime import datetime
 import pygame
+import bisect
 import json
+import math
 import os
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "1"
 import sys
+import threading
+import time
 from pathlib import Path
 from PIL import Image, ImageTk
 import unittest
 from unittest.mock import patch
 import io
 import tempfile
-import zipfile
+import wave
 import shutil
 from packaging import version
+from morse_archive import ScrollArchive, ARCHIVE_EXTENSION
+from morse_autosave import ScrollAutosaver, AUTOSAVE_INTERVAL
+from morse_core import (
+    MORSE_CODE_DICT, REVERSE_MORSE_DICT, CODE_TABLES, DEFAULT_CODE_TABLE, SAMPLE_RATE,
+    ELEMENT_UNITS, SPACED_GAP_UNITS,
+    letters_to_morse, morse_to_letters
+)
 
 # --- Constants ---
 APP_NAME = "🏛️ Ancient Morse Oracle 🏛️"
@@ -26,63 +37,277 @@ WELCOME_MESSAGE = (
     "The Oracle shall translate thy mortal words to the divine language of Morse,\n"
     "and reveal the hidden meanings within the sacred signals..."
 )
-
-# Morse Code Dictionary (expanded with ancient symbols)
-MORSE_CODE_DICT = {
-    'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 
-    'F': '..-.', 'G': '--.', 'H': '....', 'I': '..', 'J': '.---', 
-    'K': '-.-', 'L': '.-..', 'M': '--', 'N': '-.', 'O': '---', 
-    'P': '.--.', 'Q': '--.-', 'R': '.-.', 'S': '...', 'T': '-', 
-    'U': '..-', 'V': '...-', 'W': '.--', 'X': '-..-', 'Y': '-.--', 
-    'Z': '--..', '0': '-----', '1': '.----', '2': '..---', '3': '...--', 
-    '4': '....-', '5': '.....', '6': '-....', '7': '--...', '8': '---..', 
-    '9': '----.', '.': '.-.-.-', ',': '--..--', '?': '..--..', "'": '.----.', 
-    '!': '-.-.--', '/': '-..-.', '(': '-.--.', ')': '-.--.-', '&': '.-...', 
-    ':': '---...', ';': '-.-.-.', '=': '-...-', '+': '.-.-.', '-': '-....-', 
-    '_': '..--.-', '"': '.-..-.', '$': '...-..-', '@': '.--.-.', ' ': '/',
-    'Æ': '.-.-', 'Ø': '---.', 'Å': '.--.-', 'ß': '...--..', 'Ç': '-.-..',
-    'Ñ': '--.--', '§': '-.-.-', '¿': '..-.-', '¡': '--...-'
-}
-
-REVERSE_MORSE_DICT = {value: key for key, value in MORSE_CODE_DICT.items()}
+FUZZY_MAX_DISTANCE = 2  # edits forgiven per symbol when decoding corrupted signals
 
 # --- Audio Engine ---
+TONE_FREQUENCY = 800
+ECHO_UNIT_MS = 100  # length of a dot
+ECHO_GAP_MS = 50  # silence after every element
+# Echo timings in milliseconds: (tone, silence) per symbol, including the
+# American long dashes and the '_' gap inside its spaced letters
+ECHO_TIMINGS = {element: (units * ECHO_UNIT_MS, ECHO_GAP_MS) for element, units in ELEMENT_UNITS.items()}
+ECHO_TIMINGS.update({
+    '_': (0, SPACED_GAP_UNITS * ECHO_UNIT_MS - ECHO_GAP_MS),
+    ' ': (0, 250),
+    '/': (0, 500)
+})
+STREAM_BLOCK_SECONDS = 0.5  # echoes are played and saved in blocks of this length
+
 class MorseAudio:
     def __init__(self):
-        pygame.mixer.init()
-        self.dot_sound = self._generate_sound(800, 100)
-        self.dash_sound = self._generate_sound(800, 300)
-        self.space_sound = self._generate_sound(0, 100)
-        self.playing = False
-    
-    def _generate_sound(self, frequency, duration):
-        sample_rate = 44100
-        samples = int(sample_rate * duration / 1000.0)
-        buf = np.zeros((samples, 2), dtype=np.int16)
-        if frequency > 0:
-            for s in range(samples):
-                t = float(s) / sample_rate
-                buf[s][0] = int(32767.0 * np.sin(2.0 * np.pi * frequency * t))
-                buf[s][1] = int(32767.0 * np.sin(2.0 * np.pi * frequency * t))
-        return pygame.sndarray.make_sound(buf)
+        # Mono mixer: the echoes are one channel, so stereo would only double memory
+        pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=1)
+        self.sample_rate, _, self.channels = pygame.mixer.get_init()
+        self._tones = {}
+        self._buffer = np.zeros(0, dtype=np.int16)
+        self._interleaved = np.zeros((0, self.channels), dtype=np.int16)
+        self._channel = None
+        self._feeder = None
+        self._stopping = threading.Event()
+        self._queue_lock = threading.Lock()
+        self.started_at = None  # perf_counter() when the last clip began playing
+    
+    @property
+    def playing(self):
+        return self._channel is not None and self._channel.get_busy()
+    
+    def _tone(self, frequency, duration):
+        """Mono int16 tone, synthesized once per (frequency, duration)"""
+        key = (frequency, duration)
+        if key not in self._tones:
+            samples = int(self.sample_rate * duration / 1000.0)
+            tone = np.zeros(samples, dtype=np.int16)
+            if frequency > 0:
+                t = np.arange(samples) * (2.0 * np.pi * frequency / self.sample_rate)
+                np.multiply(np.sin(t, out=t), 32767.0, out=t)
+                tone[:] = t
+            self._tones[key] = tone
+        return self._tones[key]
+    
+    def _make_sound(self, samples):
+        """Hand mono samples to the mixer through the buffer protocol"""
+        if self.channels == 1:
+            return pygame.mixer.Sound(buffer=samples)
+        # Mixer opened elsewhere with more channels: duplicate at the output stage only
+        if len(self._interleaved) < len(samples):
+            self._interleaved = np.empty((len(samples), self.channels), dtype=np.int16)
+        out = self._interleaved[:len(samples)]
+        out[:] = samples[:, None]
+        return pygame.mixer.Sound(buffer=out)
+    
+    def _segments(self, code):
+        """(tone ms, tone samples, silence samples) for each echoed symbol"""
+        for char in code:
+            if char in ECHO_TIMINGS:
+                tone_ms, silence_ms = ECHO_TIMINGS[char]
+                yield (tone_ms, int(self.sample_rate * tone_ms / 1000.0),
+                       int(self.sample_rate * silence_ms / 1000.0))
+    
+    def timeline(self, code):
+        """Key-down/key-up times in seconds of the echoes, without rendering any audio"""
+        transitions = []
+        total = 0
+        for _, tone, silence in self._segments(code):
+            if tone:
+                transitions.append(total / self.sample_rate)
+                transitions.append((total + tone) / self.sample_rate)
+            total += tone + silence
+        return transitions
+    
+    def blocks(self, code, block_seconds=STREAM_BLOCK_SECONDS):
+        """Yield the echoes as successive mono int16 blocks
+
+        Each block is a view of one buffer that this generator reuses, so
+        memory stays at one block however long the message is.
+        """
+        block = np.zeros(max(1, int(block_seconds * self.sample_rate)), dtype=np.int16)
+        filled = 0
+        for tone_ms, _, silence in self._segments(code):
+            pieces = [(self._tone(TONE_FREQUENCY, tone_ms) if tone_ms else None, 0), (None, silence)]
+            for tone, length in pieces:
+                pos = 0
+                length = len(tone) if tone is not None else length
+                while pos < length:
+                    take = min(length - pos, len(block) - filled)
+                    if tone is None:
+                        block[filled:filled + take] = 0
+                    else:
+                        block[filled:filled + take] = tone[pos:pos + take]
+                    filled += take
+                    pos += take
+                    if filled == len(block):
+                        yield block
+                        filled = 0
+        if filled:
+            yield block[:filled]
+    
+    def render(self, code):
+        """Render Morse code as mono int16 samples
+
+        The returned array is a view of a buffer reused by the next render.
+        """
+        segments = []
+        total = 0
+        for tone_ms, tone_samples, silence in self._segments(code):
+            tone = self._tone(TONE_FREQUENCY, tone_ms) if tone_ms else None
+            segments.append((total, tone))
+            total += tone_samples + silence
+        
+        if len(self._buffer) < total:
+            self._buffer = np.empty(max(total, 2 * len(self._buffer)), dtype=np.int16)
+        out = self._buffer[:total]
+        out.fill(0)
+        for start, tone in segments:
+            if tone is not None:
+                out[start:start + len(tone)] = tone
+        return out
     
     def play_morse(self, code):
+        """Play Morse code in the background, streamed block by block
+
+        The first block starts playing at once; a feeder thread keeps the
+        next one queued on the channel until the message ends or ``stop``.
+        Returns True if playback started; ``started_at`` then holds the
+        clock origin of ``timeline(code)`` for visual keying.
+        """
         if self.playing:
+            return False
+        if self._feeder is not None:
+            self._feeder.join()
+        blocks = self.blocks(code)
+        first = next(blocks, None)
+        if first is None:
+            return False
+        self._stopping.clear()
+        self._channel = self._make_sound(first).play()
+        self.started_at = time.perf_counter()
+        self._feeder = threading.Thread(target=self._feed, args=(self._channel, blocks),
+                                        name="oracle-echoes", daemon=True)
+        self._feeder.start()
+        return True
+    
+    def _feed(self, channel, blocks):
+        """Queue each block behind the one playing; the mixer copies it out of the buffer"""
+        poll = STREAM_BLOCK_SECONDS / 5
+        for block in blocks:
+            sound = self._make_sound(block)
+            while True:
+                with self._queue_lock:
+                    if self._stopping.is_set() or not channel.get_busy():
+                        return
+                    if channel.get_queue() is None:
+                        channel.queue(sound)
+                        break
+                time.sleep(poll)
+    
+    def stop(self):
+        """Silence the echoes and stop feeding further blocks"""
+        with self._queue_lock:
+            self._stopping.set()
+            pygame.mixer.stop()
+    
+    def save_wav(self, code, file_path):
+        """Stream the echoes to a mono 16-bit WAV file, one block at a time"""
+        with wave.open(file_path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            for block in self.blocks(code):
+                wav.writeframes(block.byteswap() if sys.byteorder == 'big' else block)
+
+# --- Visual Keying ---
+LAMP_FRAME_MS = 16  # lamp changes are shown on ~60 Hz frames
+LAMP_SIZE = 22
+LAMP_COLOR = "#FFC040"
+
+class KeyingSchedule:
+    """Lamp state over time from alternating key-down/key-up times in seconds"""
+    def __init__(self, transitions):
+        self.times = list(transitions)
+    
+    @property
+    def duration(self):
+        return self.times[-1] if self.times else 0.0
+    
+    def state_at(self, t, previous=0):
+        """Return (lit, index) at time ``t``
+
+        ``index`` counts the transitions passed so far. Given the index of
+        the previous frame, an element that began and ended between the two
+        frames is still reported lit, so no dot is lost at high speed.
+        """
+        index = bisect.bisect_right(self.times, t)
+        lit = index % 2 == 1 or index - previous >= 2
+        return lit, index
+    
+    def next_change(self, index):
+        """Time of the transition after ``index``, or None when keying is over"""
+        return self.times[index] if index < len(self.times) else None
+
+
+class KeyingLamp:
+    """Flashing lamp that mirrors the echoes, for silent chambers
+
+    The lamp keeps no timers of its own per symbol: each frame reads one
+    clock (the moment playback began) and looks up the state in the
+    schedule. It sleeps until the frame of the next transition and, when
+    the event loop falls behind, shows the current state rather than
+    replaying missed ones.
+    """
+    def __init__(self, parent, size=LAMP_SIZE, **options):
+        self.canvas = tk.Canvas(parent, width=size, height=size, highlightthickness=0, **options)
+        self.light = self.canvas.create_oval(2, 2, size - 2, size - 2, outline="", fill="")
+        self.off_color = ""
+        self.schedule = None
+        self.origin = None
+        self._lit = False
+        self._index = 0
+        self._job = None
+    
+    @property
+    def running(self):
+        return self._job is not None
+    
+    def set_colors(self, off_color, background):
+        self.off_color = off_color
+        self.canvas.config(bg=background)
+        self.canvas.itemconfig(self.light, fill=LAMP_COLOR if self._lit else off_color)
+    
+    def play(self, transitions, origin=None):
+        """Start flashing; ``origin`` is the shared perf_counter() start time"""
+        self.stop()
+        self.schedule = KeyingSchedule(transitions)
+        self.origin = time.perf_counter() if origin is None else origin
+        self._index = 0
+        self._frame()
+    
+    def stop(self):
+        if self._job is not None:
+            self.canvas.after_cancel(self._job)
+            self._job = None
+        self._show(False)
+    
+    def _show(self, lit):
+        if lit != self._lit:  # only touch the canvas on a change
+            self._lit = lit
+            self.canvas.itemconfig(self.light, fill=LAMP_COLOR if lit else self.off_color)
+    
+    def _frame(self):
+        now = time.perf_counter() - self.origin
+        lit, self._index = self.schedule.state_at(now, self._index)
+        self._show(lit)
+        
+        change = self.schedule.next_change(self._index)
+        if change is None and not lit:
+            self._job = None
             return
-            
-        self.playing = True
-        for char in code:
-            if char == '.':
-                self.dot_sound.play()
-                pygame.time.delay(150)
-            elif char == '-':
-                self.dash_sound.play()
-                pygame.time.delay(350)
-            elif char == ' ':
-                pygame.time.delay(250)
-            elif char == '/':
-                pygame.time.delay(500)
-        self.playing = False
+        if change is None or lit != (self._index % 2 == 1):
+            delay = LAMP_FRAME_MS  # hold a squeezed-in flash for one frame
+        else:
+            # Wake on the frame boundary (counted from the origin) of the next change
+            frame = math.ceil(change * 1000.0 / LAMP_FRAME_MS) * LAMP_FRAME_MS
+            delay = max(1, int(frame - now * 1000.0))
+        self._job = self.canvas.after(delay, self._frame)
 
 # --- Ancient Theme System ---
 class AncientThemes:
@@ -127,34 +352,6 @@ class AncientThemes:
     def get_theme(self, name=None):
         return self.themes.get(name or self.current_theme, self.themes["Stone Tablet"])
 
-# --- Core Translation Functions ---
-def letters_to_morse(text):
-    """Convert text to Morse code with ancient symbols support"""
-    morse = []
-    for char in text.upper():
-        if char in MORSE_CODE_DICT:
-            morse.append(MORSE_CODE_DICT[char])
-        elif char == '\n':
-            morse.append('/')
-        else:
-            morse.append('�')  # Unknown character symbol
-    return ' '.join(morse)
-
-def morse_to_letters(code):
-    """Convert Morse code to text with error handling"""
-    words = code.split(' / ')
-    decoded = []
-    for word in words:
-        letters = word.split()
-        dec_word = []
-        for letter in letters:
-            if letter in REVERSE_MORSE_DICT:
-                dec_word.append(REVERSE_MORSE_DICT[letter])
-            else:
-                dec_word.append('�')  # Unknown Morse symbol
-        decoded.append(''.join(dec_word))
-    return ' '.join(decoded)
-
 # --- Main Application ---
 class AncientMorseOracle:
     def __init__(self, root):
@@ -169,6 +366,8 @@ class AncientMorseOracle:
         self.themes = AncientThemes()
         self.history = []
         self.current_file = None
+        self.autosaver = ScrollAutosaver()
+        self._autosave_job = None
         
        
         style = ttk.Style()
@@ -186,6 +385,10 @@ class AncientMorseOracle:
         # Display welcome message
         self._show_welcome_message()
         
+        # Autosave edits, and offer back whatever a crash left behind
+        self.input_text.bind("<<Modified>>", self._on_input_modified)
+        self._offer_recovery()
+        
         # Initialize audio (lazy load)
         self.audio_enabled = True
     
@@ -213,6 +416,9 @@ class AncientMorseOracle:
         file_menu.add_command(label="Save", command=self._save_file, accelerator="Ctrl+S")
         file_menu.add_command(label="Save As...", command=self._save_file_as, accelerator="Ctrl+Shift+S")
         file_menu.add_separator()
+        file_menu.add_command(label="Add to Archive...", command=self._add_to_archive)
+        file_menu.add_command(label="Import Scrolls to Archive...", command=self._import_to_archive)
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self._confirm_exit, accelerator="Alt+F4")
         menubar.add_cascade(label="Scrolls", menu=file_menu)
         
@@ -237,6 +443,24 @@ class AncientMorseOracle:
             )
         menubar.add_cascade(label="Visions", menu=view_menu)
         
+        # Code table menu
+        table_menu = tk.Menu(menubar, tearoff=0)
+        self.table_var = tk.StringVar(value=DEFAULT_CODE_TABLE)
+        for table_name, table in CODE_TABLES.items():
+            table_menu.add_radiobutton(
+                label=f"{table_name} - {table.description}",
+                variable=self.table_var,
+                value=table_name,
+                command=self._change_code_table
+            )
+        table_menu.add_separator()
+        self.fuzzy_var = tk.BooleanVar(value=False)
+        table_menu.add_checkbutton(
+            label="Forgive Corrupted Signals",
+            variable=self.fuzzy_var
+        )
+        menubar.add_cascade(label="Tongues", menu=table_menu)
+        
         # Audio menu
         audio_menu = tk.Menu(menubar, tearoff=0)
         audio_menu.add_command(
@@ -249,6 +473,16 @@ class AncientMorseOracle:
             command=self._stop_audio,
             accelerator="Ctrl+Shift+P"
         )
+        self.silent_var = tk.BooleanVar(value=False)
+        audio_menu.add_checkbutton(
+            label="Silent Chamber (Lamp Only)",
+            variable=self.silent_var
+        )
+        audio_menu.add_separator()
+        audio_menu.add_command(
+            label="Save Echoes as WAV...",
+            command=self._save_echoes
+        )
         menubar.add_cascade(label="Echoes", menu=audio_menu)
         
         # Help menu
@@ -366,6 +600,10 @@ class AncientMorseOracle:
             state=tk.NORMAL if self.audio_enabled else tk.DISABLED
         ).pack(side=tk.LEFT, padx=5)
         
+        # Flashes in step with the echoes
+        self.lamp = KeyingLamp(button_frame)
+        self.lamp.canvas.pack(side=tk.LEFT, padx=5)
+        
         ttk.Button(
             button_frame,
             text="Clear Tablets",
@@ -470,6 +708,8 @@ class AncientMorseOracle:
             font=("Courier New", 14)  # Consistent larger font
         )
         
+        self.lamp.set_colors(theme["button_bg"], theme["bg"])
+        
         # Label frames
         style.configure('TLabelframe',
                       background=theme["bg"],
@@ -497,21 +737,27 @@ class AncientMorseOracle:
         
         try:
             if self.mode_var.get() == "encode":
-                result = letters_to_morse(input_text)
+                result = letters_to_morse(input_text, self.table_var.get())
             else:
-                result = morse_to_letters(input_text)
+                result = morse_to_letters(
+                    input_text,
+                    self.table_var.get(),
+                    max_distance=FUZZY_MAX_DISTANCE if self.fuzzy_var.get() else 0
+                )
               
             
             self.output_text.config(state=tk.NORMAL)
             self.output_text.delete("1.0", tk.END)
             self.output_text.insert(tk.END, result)
             self.output_text.config(state=tk.DISABLED)
+            self._schedule_autosave()
             
             # Add to history
             self.history.append({
                 "mode": self.mode_var.get(),
                 "input": input_text,
                 "output": result,
+                "table": self.table_var.get(),
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             })
             
@@ -548,12 +794,45 @@ class AncientMorseOracle:
             )
             return
         
-        self.audio.play_morse(morse_code)
+        if self.silent_var.get():
+            if not self.audio.playing:
+                self.lamp.play(self.audio.timeline(morse_code))
+            self.status_var.set("The lamp flickers with the silent echoes...")
+            return
+        
+        if self.audio.play_morse(morse_code):
+            self.lamp.play(self.audio.timeline(morse_code), self.audio.started_at)
         self.status_var.set("The echoes of Morse code fill the chamber...")
     
+    def _save_echoes(self):
+        """Save the current Morse code as a WAV recording"""
+        morse_code = self.output_text.get("1.0", tk.END).strip()
+        if self.mode_var.get() == "decode" or not morse_code:
+            messagebox.showwarning(
+                "Silent Oracle",
+                "No Morse code to record. Encode a message first."
+            )
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            title="Capture the Echoes",
+            defaultextension=".wav",
+            filetypes=[("Wave Files", "*.wav"), ("All Files", "*.*")]
+        )
+        if file_path:
+            try:
+                self.audio.save_wav(morse_code, file_path)
+                self.status_var.set(f"Echoes captured: {os.path.basename(file_path)}")
+            except Exception as e:
+                messagebox.showerror(
+                    "Echoes Lost",
+                    f"The echoes could not be captured!\n\n{str(e)}"
+                )
+    
     def _stop_audio(self):
         """Stop any currently playing audio"""
-        pygame.mixer.stop()
+        self.audio.stop()
+        self.lamp.stop()
         self.status_var.set("The echoes fade to silence...")
     
     def _new_file(self):
@@ -564,6 +843,7 @@ class AncientMorseOracle:
             self.output_text.delete("1.0", tk.END)
             self.output_text.config(state=tk.DISABLED)
             self.current_file = None
+            self.autosaver.discard()
             self.status_var.set("New tablet prepared...")
     
     def _open_file(self):
@@ -583,15 +863,7 @@ class AncientMorseOracle:
                     with open(file_path, 'r') as f:
                         data = json.load(f)
                     
-                    self.input_text.delete("1.0", tk.END)
-                    self.input_text.insert(tk.END, data.get("input", ""))
-                    
-                    self.output_text.config(state=tk.NORMAL)
-                    self.output_text.delete("1.0", tk.END)
-                    self.output_text.insert(tk.END, data.get("output", ""))
-                    self.output_text.config(state=tk.DISABLED)
-                    
-                    self.mode_var.set(data.get("mode", "encode"))
+                    self._load_scroll(data)
                     self.current_file = file_path
                     
                     self.status_var.set(f"Opened: {os.path.basename(file_path)}")
@@ -601,6 +873,53 @@ class AncientMorseOracle:
                         f"The sacred scroll could not be read!\n\n{str(e)}"
                     )
     
+    def _load_scroll(self, data):
+        """Fill the tablets from a scroll dict"""
+        self.input_text.delete("1.0", tk.END)
+        self.input_text.insert(tk.END, data.get("input", ""))
+        
+        self.output_text.config(state=tk.NORMAL)
+        self.output_text.delete("1.0", tk.END)
+        self.output_text.insert(tk.END, data.get("output", ""))
+        self.output_text.config(state=tk.DISABLED)
+        
+        self.mode_var.set(data.get("mode", "encode"))
+        self.table_var.set(data.get("table", DEFAULT_CODE_TABLE))
+    
+    def _on_input_modified(self, event=None):
+        """Note an edit; the autosave timer coalesces bursts of typing"""
+        if self.input_text.edit_modified():
+            self.input_text.edit_modified(False)
+            self._schedule_autosave()
+    
+    def _schedule_autosave(self):
+        """Autosave once AUTOSAVE_INTERVAL after the first unsaved edit"""
+        if self._autosave_job is None:
+            self._autosave_job = self.root.after(int(AUTOSAVE_INTERVAL * 1000), self._autosave)
+    
+    def _autosave(self):
+        """Hand a snapshot to the background writer"""
+        self._autosave_job = None
+        data = self._scroll_data()
+        data["file"] = self.current_file
+        self.autosaver.save(data)
+        if self.autosaver.last_error:
+            self.status_var.set(f"Autosave failed: {self.autosaver.last_error}")
+    
+    def _offer_recovery(self):
+        """Restore the autosave left by a session that did not close cleanly"""
+        data = self.autosaver.recover()
+        if data and (data.get("input") or data.get("output")) and messagebox.askyesno(
+            "Lost Prophecy Found",
+            f"An unsaved translation from {data.get('timestamp', 'a past session')} survived.\n"
+            "Restore it to the tablets?"
+        ):
+            self._load_scroll(data)
+            self.current_file = data.get("file")
+            self._autosave()  # now this window's own autosave
+            self.status_var.set("A lost prophecy has been restored...")
+        self.autosaver.drop_recovered()
+    
     def _save_file(self):
         """Save the current translation"""
         if self.current_file:
@@ -624,28 +943,86 @@ class AncientMorseOracle:
             self._save_to_file(file_path)
             self.current_file = file_path
     
-    def _save_to_file(self, file_path):
-        """Save data to specified file"""
-        data = {
+    def _scroll_data(self):
+        """Snapshot the current translation as a scroll dict"""
+        return {
             "input": self.input_text.get("1.0", tk.END).strip(),
             "output": self.output_text.get("1.0", tk.END).strip(),
             "mode": self.mode_var.get(),
+            "table": self.table_var.get(),
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "version": VERSION
         }
-        
-        try:
-            with open(file_path, 'w') as f:
-                json.dump(data, f, indent=2)
-            
+    
+    def _save_to_file(self, file_path):
+        """Save data to specified file on the background writer"""
+        future = self.autosaver.save_as(file_path, self._scroll_data())
+        self.status_var.set(f"Preserving {os.path.basename(file_path)}...")
+        self._watch_save(future, file_path)
+        return True
+    
+    def _watch_save(self, future, file_path):
+        """Report a background save once it finishes, without blocking the window"""
+        if not future.done():
+            self.root.after(50, self._watch_save, future, file_path)
+            return
+        error = future.exception()
+        if error is None:
             self.status_var.set(f"Preserved: {os.path.basename(file_path)}")
-            return True
-        except Exception as e:
+        else:
             messagebox.showerror(
                 "Preservation Failed",
-                f"The Oracle's words could not be preserved!\n\n{str(e)}"
+                f"The Oracle's words could not be preserved!\n\n{str(error)}"
+            )
+    
+    def _ask_archive_path(self):
+        """Ask for a scroll archive to append to (created if missing)"""
+        return filedialog.asksaveasfilename(
+            title="Choose the Great Archive",
+            defaultextension=ARCHIVE_EXTENSION,
+            confirmoverwrite=False,
+            filetypes=[
+                ("Oracle Archives", f"*{ARCHIVE_EXTENSION}"),
+                ("All Files", "*.*")
+            ]
+        )
+    
+    def _add_to_archive(self):
+        """Append the current translation to a scroll archive"""
+        archive_path = self._ask_archive_path()
+        if not archive_path:
+            return
+        try:
+            with ScrollArchive(archive_path) as archive:
+                archive.add(self._scroll_data())
+                count = len(archive)
+            self.status_var.set(f"Archived in {os.path.basename(archive_path)} ({count} scrolls)")
+        except Exception as e:
+            messagebox.showerror(
+                "Archive Sealed",
+                f"The scroll could not be archived!\n\n{str(e)}"
+            )
+    
+    def _import_to_archive(self):
+        """Gather existing .mor scrolls into a scroll archive"""
+        scroll_paths = filedialog.askopenfilenames(
+            title="Choose Scrolls to Archive",
+            filetypes=[("Oracle Files", "*.mor")]
+        )
+        if not scroll_paths:
+            return
+        archive_path = self._ask_archive_path()
+        if not archive_path:
+            return
+        try:
+            with ScrollArchive(archive_path) as archive:
+                added = archive.import_scrolls(scroll_paths)
+            self.status_var.set(f"{len(added)} scrolls gathered into {os.path.basename(archive_path)}")
+        except Exception as e:
+            messagebox.showerror(
+                "Archive Sealed",
+                f"The scrolls could not be archived!\n\n{str(e)}"
             )
-            return False
     
     def _check_unsaved_changes(self):
         """Check for unsaved changes and prompt to save"""
@@ -694,6 +1071,10 @@ class AncientMorseOracle:
         self._apply_theme()
         self.status_var.set(f"Vision changed to {self.themes.current_theme}...")
     
+    def _change_code_table(self):
+        """Switch the alphabet used for translation"""
+        self.status_var.set(f"The Oracle now speaks in {self.table_var.get()} Morse...")
+    
     def _show_welcome_message(self):
         """Display welcome message in output area"""
         self.output_text.config(state=tk.NORMAL)
@@ -855,6 +1236,11 @@ class AncientMorseOracle:
     def _confirm_exit(self):
         """Confirm before exiting application"""
         if self._check_unsaved_changes():
+            if self._autosave_job is not None:
+                self.root.after_cancel(self._autosave_job)
+            self.autosaver.discard()
+            self.autosaver.close()
+            self.lamp.stop()
             self.root.destroy()
     
     def run(self):
@@ -900,9 +1286,11 @@ def create_windows_installer():
 class TestAncientMorseOracle(unittest.TestCase):
     def setUp(self):
         self.root = tk.Tk()
-        self.app = AncientMorseOracle(self.root)
+        with patch.object(ScrollAutosaver, "recover", return_value=None):
+            self.app = AncientMorseOracle(self.root)
     
     def tearDown(self):
+        self.app.autosaver.close()
         self.root.destroy()
     
     def test_letters_to_morse(self):
@@ -933,6 +1321,97 @@ class TestAncientMorseOracle(unittest.TestCase):
         output = self.app.output_text.get("1.0", tk.END).strip()
         self.assertEqual(output, "TEST")
 
+class TestMorseAudio(unittest.TestCase):
+    def setUp(self):
+        self.audio = MorseAudio()
+    
+    def tearDown(self):
+        pygame.mixer.quit()
+    
+    def test_mono_render_length(self):
+        samples = self.audio.render(".- /")
+        self.assertEqual(samples.ndim, 1)
+        self.assertEqual(len(samples), sum(
+            int(self.audio.sample_rate * t / 1000.0) for t in (100, 50, 300, 50, 250, 500)
+        ))
+        self.assertTrue(samples[:100].any())
+        self.assertFalse(samples[-100:].any())
+    
+    def test_render_reuses_buffer(self):
+        first = self.audio.render("-- --")
+        second = self.audio.render(".")
+        self.assertTrue(np.shares_memory(first, second))
+        self.assertEqual(self.audio.render(".").tobytes(), second.tobytes())
+    
+    def test_american_long_dashes_and_spaced_letters(self):
+        rate = self.audio.sample_rate
+        edges = self.audio.timeline(letters_to_morse("COL", "American"))
+        tones = [round((up - down) * 1000) for down, up in zip(edges[::2], edges[1::2])]
+        self.assertEqual(tones, [100, 100, 100, 100, 100, 500])  # C is '.._.', O '._.', L '⸺'
+        self.assertEqual(round((edges[4] - edges[3]) * 1000), SPACED_GAP_UNITS * ECHO_UNIT_MS)
+        self.assertEqual(len(self.audio.render(".⸻")),
+                         sum(int(rate * ms / 1000.0) for ms in (100, 50, 700, 50)))
+    
+    def test_blocks_reuse_one_buffer(self):
+        code = "... --- ... / -.-."
+        blocks = [block.copy() for block in self.audio.blocks(code, block_seconds=0.1)]
+        size = int(0.1 * self.audio.sample_rate)
+        self.assertTrue(all(len(block) == size for block in blocks[:-1]))
+        self.assertEqual(np.concatenate(blocks).tobytes(), self.audio.render(code).tobytes())
+        stream = self.audio.blocks(code, block_seconds=0.1)
+        self.assertTrue(np.shares_memory(next(stream), next(stream)))
+        self.assertEqual(list(self.audio.blocks("")), [])
+    
+    def test_streamed_playback_stops(self):
+        self.assertTrue(self.audio.play_morse("-" * 100))
+        self.assertFalse(self.audio.play_morse("."))
+        self.assertTrue(self.audio.playing)
+        self.audio.stop()
+        self.audio._feeder.join(2.0)
+        self.assertFalse(self.audio._feeder.is_alive())
+        self.assertFalse(self.audio.playing)
+    
+    def test_save_wav(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "sos.wav")
+            self.audio.save_wav("... --- ...", path)
+            with wave.open(path) as wav:
+                self.assertEqual(wav.getnchannels(), 1)
+                self.assertEqual(wav.getnframes(), len(self.audio.render("... --- ...")))
+                self.assertEqual(wav.readframes(wav.getnframes()), self.audio.render("... --- ...").tobytes())
+
+class TestKeyingSchedule(unittest.TestCase):
+    def test_state_lookup(self):
+        schedule = KeyingSchedule([0.0, 0.1, 0.15, 0.45])
+        self.assertEqual(schedule.state_at(0.05), (True, 1))
+        self.assertEqual(schedule.state_at(0.12, 1), (False, 2))
+        self.assertEqual(schedule.state_at(0.3, 2), (True, 3))
+        self.assertEqual(schedule.state_at(1.0, 3), (False, 4))
+        self.assertIsNone(schedule.next_change(4))
+        self.assertEqual(schedule.duration, 0.45)
+    
+    def test_short_element_between_frames_still_flashes(self):
+        schedule = KeyingSchedule([0.010, 0.015])
+        self.assertEqual(schedule.state_at(0.016, 0), (True, 2))
+        self.assertEqual(schedule.state_at(0.032, 2), (False, 2))
+    
+    def test_matches_rendered_echoes(self):
+        pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=1)
+        try:
+            audio = MorseAudio()
+            transitions = audio.timeline(".- .")
+            self.assertEqual(len(audio._buffer), 0)  # no audio behind the timeline
+            samples = audio.render(".- .")
+            schedule = KeyingSchedule(transitions)
+            self.assertEqual(len(transitions), 6)
+            edges = transitions + [len(samples) / audio.sample_rate]
+            for i, (start, end) in enumerate(zip(edges, edges[1:])):
+                middle = (start + end) / 2
+                span = samples[int(start * audio.sample_rate):int(end * audio.sample_rate)]
+                self.assertEqual(schedule.state_at(middle, i), (span.any(), i + 1))
+        finally:
+            pygame.mixer.quit()
+
 # --- Main Execution ---
 if __name__ == "__main__":
     # Check if we're creating an installer
@@ -0,0 +1,921 @@
+import math
+import mmap
+import os
+import struct
+import unicodedata
+import sys
+import wave
+import io
+import tempfile
+import unittest
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Morse Code Dictionary (expanded with ancient symbols)
+MORSE_CODE_DICT = {
+    'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 
+    'F': '..-.', 'G': '--.', 'H': '....', 'I': '..', 'J': '.---', 
+    'K': '-.-', 'L': '.-..', 'M': '--', 'N': '-.', 'O': '---', 
+    'P': '.--.', 'Q': '--.-', 'R': '.-.', 'S': '...', 'T': '-', 
+    'U': '..-', 'V': '...-', 'W': '.--', 'X': '-..-', 'Y': '-.--', 
+    'Z': '--..', '0': '-----', '1': '.----', '2': '..---', '3': '...--', 
+    '4': '....-', '5': '.....', '6': '-....', '7': '--...', '8': '---..', 
+    '9': '----.', '.': '.-.-.-', ',': '--..--', '?': '..--..', "'": '.----.', 
+    '!': '-.-.--', '/': '-..-.', '(': '-.--.', ')': '-.--.-', '&': '.-...', 
+    ':': '---...', ';': '-.-.-.', '=': '-...-', '+': '.-.-.', '-': '-....-', 
+    '_': '..--.-', '"': '.-..-.', '$': '...-..-', '@': '.--.-.', ' ': '/',
+    'Æ': '.-.-', 'Ø': '---.', 'Å': '.--.-', 'ß': '...--..', 'Ç': '-.-..',
+    'Ñ': '--.--', '§': '-.-.-', '¿': '..-.-', '¡': '--...-'
+}
+
+# --- Code Tables ---
+WORD_SEPARATOR = '/'
+DEFAULT_CODE_TABLE = "ITU"
+
+_DIGITS = {str(d): MORSE_CODE_DICT[str(d)] for d in range(10)}
+
+# American (railroad) Morse uses elements the ITU alphabet lacks: '⸺' is the
+# long dash of L, '⸻' the longer dash of 0, and '_' marks the extra gap
+# inside spaced letters such as C (.. .)
+AMERICAN_MORSE_DICT = {
+    'A': '.-', 'B': '-...', 'C': '.._.', 'D': '-..', 'E': '.',
+    'F': '.-.', 'G': '--.', 'H': '....', 'I': '..', 'J': '-.-.',
+    'K': '-.-', 'L': '⸺', 'M': '--', 'N': '-.', 'O': '._.',
+    'P': '.....', 'Q': '..-.', 'R': '._..', 'S': '...', 'T': '-',
+    'U': '..-', 'V': '...-', 'W': '.--', 'X': '.-..', 'Y': '.._..',
+    'Z': '..._.', '&': '._...', '1': '.--.', '2': '..-..', '3': '...-.',
+    '4': '....-', '5': '---', '6': '......', '7': '--..', '8': '-....',
+    '9': '-..-', '0': '⸻', '.': '..--..', ',': '.-.-', '?': '-..-.',
+    '!': '---.'
+}
+
+# Wabun code (Japanese katakana)
+WABUN_MORSE_DICT = {
+    'イ': '.-', 'ロ': '.-.-', 'ハ': '-...', 'ニ': '-.-.', 'ホ': '-..',
+    'ヘ': '.', 'ト': '..-..', 'チ': '..-.', 'リ': '--.', 'ヌ': '....',
+    'ル': '-.--.', 'ヲ': '.---', 'ワ': '-.-', 'カ': '.-..', 'ヨ': '--',
+    'タ': '-.', 'レ': '---', 'ソ': '---.', 'ツ': '.--.', 'ネ': '--.-',
+    'ナ': '.-.', 'ラ': '...', 'ム': '-', 'ウ': '..-', 'ヰ': '.-..-',
+    'ノ': '..--', 'オ': '.-...', 'ク': '...-', 'ヤ': '.--', 'マ': '-..-',
+    'ケ': '-.--', 'フ': '--..', 'コ': '----', 'エ': '-.---', 'テ': '.-.--',
+    'ア': '--.--', 'サ': '-.-.-', 'キ': '-.-..', 'ユ': '-..--', 'メ': '-...-',
+    'ミ': '..-.-', 'シ': '--.-.', 'ヱ': '.--..', 'ヒ': '--..-', 'モ': '-..-.',
+    'セ': '.---.', 'ス': '---.-', 'ン': '.-.-.', '゛': '..', '゜': '..--.',
+    'ー': '.--.-', '、': '.-.-.-', '」': '.-.-..', '（': '-.--.-', '）': '.-..-.'
+}
+
+# Hiragana and combining (semi-)voiced marks are keyed as their katakana forms
+WABUN_ALIASES = {
+    **{chr(ord(kana) - 0x60): kana for kana in WABUN_MORSE_DICT if 'ア' <= kana <= 'ン'},
+    '\u3099': '゛', '\u309a': '゜'
+}
+
+# Russian Morse (Cyrillic)
+CYRILLIC_MORSE_DICT = {
+    'А': '.-', 'Б': '-...', 'В': '.--', 'Г': '--.', 'Д': '-..',
+    'Е': '.', 'Ж': '...-', 'З': '--..', 'И': '..', 'Й': '.---',
+    'К': '-.-', 'Л': '.-..', 'М': '--', 'Н': '-.', 'О': '---',
+    'П': '.--.', 'Р': '.-.', 'С': '...', 'Т': '-', 'У': '..-',
+    'Ф': '..-.', 'Х': '....', 'Ц': '-.-.', 'Ч': '---.', 'Ш': '----',
+    'Щ': '--.-', 'Ъ': '--.--', 'Ы': '-.--', 'Ь': '-..-', 'Э': '..-..',
+    'Ю': '..--', 'Я': '.-.-', **_DIGITS,
+    '.': '......', ',': '.-.-.-', '?': '..--..', '!': '--..--', '-': '-....-',
+    ':': '---...', ';': '-.-.-.', '"': '.-..-.', "'": '.----.', '/': '-..-.'
+}
+
+CYRILLIC_ALIASES = {'Ё': 'Е'}
+
+# Greek Morse
+GREEK_MORSE_DICT = {
+    'Α': '.-', 'Β': '-...', 'Γ': '--.', 'Δ': '-..', 'Ε': '.',
+    'Ζ': '--..', 'Η': '....', 'Θ': '-.-.', 'Ι': '..', 'Κ': '-.-',
+    'Λ': '.-..', 'Μ': '--', 'Ν': '-.', 'Ξ': '-..-', 'Ο': '---',
+    'Π': '.--.', 'Ρ': '.-.', 'Σ': '...', 'Τ': '-', 'Υ': '-.--',
+    'Φ': '..-.', 'Χ': '----', 'Ψ': '--.-', 'Ω': '.--', **_DIGITS,
+    '.': '.-.-.-', ',': '--..--', '?': '..--..'
+}
+
+GREEK_ALIASES = {
+    'Ά': 'Α', 'Έ': 'Ε', 'Ή': 'Η', 'Ί': 'Ι', 'Ϊ': 'Ι',
+    'Ό': 'Ο', 'Ύ': 'Υ', 'Ϋ': 'Υ', 'Ώ': 'Ω'
+}
+
+
+# --- Unicode Folding ---
+UNKNOWN_SYMBOL = '�'
+
+# Typographic punctuation and spacing written the way the code tables spell it
+PUNCTUATION_FOLDS = {
+    '\n': ' ', '\t': ' ', '\u00a0': ' ', '\u2002': ' ', '\u2003': ' ', '\u2007': ' ',
+    '\u2009': ' ', '\u200a': ' ', '\u202f': ' ', '\u3000': ' ',
+    '‘': "'", '’': "'", '‚': "'", '‛': "'", '′': "'", '`': "'", '´': "'", 'ʼ': "'",
+    '“': '"', '”': '"', '„': '"', '‟': '"', '″': '"', '«': '"', '»': '"',
+    '‐': '-', '‑': '-', '‒': '-', '–': '-', '—': '-', '―': '-', '−': '-',
+    '…': '...', '⁄': '/', '\u00ad': '', '\u200b': '', '\u200c': '', '\u200d': '', '\ufeff': ''
+}
+
+# Letters with no decomposition, spelled the way their languages transliterate them
+LETTER_FOLDS = {
+    'Œ': 'OE', 'Æ': 'AE', 'Ø': 'O', 'Ł': 'L', 'Đ': 'D', 'Ð': 'D', 'Þ': 'TH',
+    'Ħ': 'H', 'Ŧ': 'T', 'Ŋ': 'N', 'Ɨ': 'I', 'ĸ': 'K', 'ß': 'SS'
+}
+
+# Code points folded ahead of time, besides the keys of the fold tables:
+# Latin, Greek, Cyrillic, general punctuation, letterlike symbols and
+# number forms, kana, ligatures, and the BOM and full-width forms.
+# Anything else encodes as unknown.
+FOLD_RANGES = [
+    (0x0000, 0x0530), (0x1E00, 0x2070), (0x2100, 0x2190),
+    (0x3000, 0x3100), (0xFB00, 0xFB07), (0xFE00, 0xFFF0)
+]
+
+
+class FoldingTable(dict):
+    """``str.translate`` table from code points to Morse, each code followed by ' '"""
+    __slots__ = ()
+
+    def __missing__(self, key):
+        return UNKNOWN_SYMBOL + ' '
+
+
+def _fold_char(char, encode, depth=0):
+    """Codes spelling ``char`` in a table, or None if it cannot be written
+
+    Tried in order: the symbol itself, its upper and lower case (so 'ẞ'
+    finds 'ß'), typographic punctuation and transliterated letters, then
+    its NFKD form with accents dropped (combining marks the table knows,
+    like Wabun's dakuten, are kept). Table letters such as 'Ñ' or 'Å'
+    therefore win over their stripped forms.
+    """
+    if char in encode:
+        return [encode[char]]
+    if depth > 2:
+        return None
+    candidates = [char.upper(), char.lower(), PUNCTUATION_FOLDS.get(char), LETTER_FOLDS.get(char)]
+    decomposed = unicodedata.normalize('NFKD', char)
+    candidates.append(''.join(c for c in decomposed if c in encode or not unicodedata.combining(c)))
+    for candidate in candidates:
+        if candidate is None or candidate == char:
+            continue
+        codes = []
+        for part in candidate:
+            folded = _fold_char(part, encode, depth + 1)
+            if folded is None:
+                break
+            codes.extend(folded)
+        else:
+            return codes
+    return None
+
+
+def build_folding_table(encode):
+    """Precompute the code point -> Morse translation for one table"""
+    table = FoldingTable()
+    chars = {chr(point) for start, stop in FOLD_RANGES for point in range(start, stop)}
+    chars.update(encode)
+    chars.update(char.lower() for char in encode)
+    chars.update(PUNCTUATION_FOLDS)
+    chars.update(LETTER_FOLDS)
+    for char in chars:
+        codes = _fold_char(char, encode)
+        if codes is not None:
+            table[ord(char)] = ''.join(code + ' ' for code in codes)
+    return table
+
+
+class CompiledCodeTable:
+    """Encode/decode lookups built from a code table"""
+    __slots__ = ("name", "encode", "decode", "fold")
+
+    def __init__(self, name, encode, decode):
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+        self.fold = build_folding_table(encode)
+
+
+class CodeTable:
+    """A named Morse alphabet, compiled into lookup dicts on first use"""
+    def __init__(self, name, codes, aliases=None, description=""):
+        self.name = name
+        self.codes = dict(codes)
+        self.aliases = dict(aliases or {})
+        self.description = description
+        self._compiled = None
+
+    def compile(self):
+        """Build (once) the encode and decode lookups for this table
+
+        Every code must decode to exactly one symbol; symbols that should
+        share a code belong in ``aliases`` instead. Collisions raise
+        ValueError here rather than surfacing as wrong letters mid-decode.
+        """
+        if self._compiled is not None:
+            return self._compiled
+
+        codes = dict(self.codes)
+        codes.setdefault(' ', WORD_SEPARATOR)
+
+        decode = {}
+        collisions = {}
+        for char, code in codes.items():
+            if code in decode:
+                collisions.setdefault(code, [decode[code]]).append(char)
+            else:
+                decode[code] = char
+        if collisions:
+            details = ", ".join(f"{code!r}: {'/'.join(chars)}" for code, chars in collisions.items())
+            raise ValueError(f"Ambiguous codes in table {self.name!r}: {details}")
+
+        encode = dict(codes)
+        for alias, target in self.aliases.items():
+            if target not in codes:
+                raise ValueError(f"Alias {alias!r} in table {self.name!r} points to unknown symbol {target!r}")
+            encode[alias] = codes[target]
+
+        self._compiled = CompiledCodeTable(self.name, encode, decode)
+        return self._compiled
+
+
+CODE_TABLES = {}
+
+
+def register_code_table(table):
+    """Add a code table to the registry (compiled lazily on first lookup)"""
+    CODE_TABLES[table.name] = table
+    return table
+
+
+def get_code_table(name=None):
+    """Return the compiled code table registered under ``name``"""
+    if isinstance(name, CompiledCodeTable):
+        return name
+    try:
+        return CODE_TABLES[name or DEFAULT_CODE_TABLE].compile()
+    except KeyError:
+        raise KeyError(f"Unknown code table: {name!r}") from None
+
+
+register_code_table(CodeTable("ITU", MORSE_CODE_DICT, description="International Morse (with ancient symbols)"))
+register_code_table(CodeTable("American", AMERICAN_MORSE_DICT, description="American railroad Morse"))
+register_code_table(CodeTable("Wabun", WABUN_MORSE_DICT, WABUN_ALIASES, description="Japanese Wabun code"))
+register_code_table(CodeTable("Cyrillic", CYRILLIC_MORSE_DICT, CYRILLIC_ALIASES, description="Russian Morse"))
+register_code_table(CodeTable("Greek", GREEK_MORSE_DICT, GREEK_ALIASES, description="Greek Morse"))
+
+REVERSE_MORSE_DICT = get_code_table(DEFAULT_CODE_TABLE).decode
+
+# --- Core Translation Functions ---
+def letters_to_morse(text, table=None):
+    """Convert text to Morse code with ancient symbols support"""
+    morse = text.translate(get_code_table(table).fold)
+    return morse[:-1]  # every symbol's code carries a trailing separator
+
+def morse_to_letters(code, table=None, max_distance=0):
+    """Convert Morse code to text with error handling
+
+    With ``max_distance`` > 0, unknown symbols decode to their nearest
+    code within that many edits instead of '�'.
+    """
+    decode = get_code_table(table).decode
+    index = fuzzy_index(table, max_distance) if max_distance else None
+    words = code.split(f' {WORD_SEPARATOR} ')
+    decoded = []
+    for word in words:
+        letters = word.split()
+        dec_word = []
+        for letter in letters:
+            if letter in decode:
+                dec_word.append(decode[letter])
+            elif index and (candidates := index.lookup(letter)):
+                dec_word.append(candidates[0][0])
+            else:
+                dec_word.append('�')  # Unknown Morse symbol
+        decoded.append(''.join(dec_word))
+    return ' '.join(decoded)
+
+def decode_with_confidence(code, table=None, max_distance=2):
+    """Decode Morse code into (char, confidence) pairs, one per symbol
+
+    Known symbols and word gaps score 1.0; corrupted symbols take their
+    best fuzzy match, or ('�', 0.0) when nothing is close enough.
+    """
+    decode = get_code_table(table).decode
+    index = fuzzy_index(table, max_distance)
+    decoded = []
+    for i, word in enumerate(code.split(f' {WORD_SEPARATOR} ')):
+        if i:
+            decoded.append((' ', 1.0))
+        for letter in word.split():
+            if letter in decode:
+                decoded.append((decode[letter], 1.0))
+            else:
+                candidates = index.lookup(letter)
+                decoded.append(candidates[0] if candidates else ('�', 0.0))
+    return decoded
+
+# --- Fuzzy Symbol Matching ---
+FUZZY_EDIT_WEIGHT = 0.25  # relative likelihood of each extra edit
+FUZZY_CACHE_SIZE = 65536
+
+
+def edit_distance(a, b):
+    """Levenshtein distance between two element strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+
+def _deletions(code, depth):
+    """All strings reachable from ``code`` by deleting up to ``depth`` elements"""
+    found = {code}
+    frontier = {code}
+    for _ in range(depth):
+        frontier = {s[:i] + s[i + 1:] for s in frontier for i in range(len(s))}
+        found |= frontier
+    return found
+
+
+class FuzzyIndex:
+    """Deletion-neighbourhood index over one code table's symbols
+
+    Two strings are within ``max_distance`` edits only if they share a
+    string reachable by at most ``max_distance`` deletions from each, so a
+    lookup touches a handful of buckets instead of scanning the table.
+    """
+    def __init__(self, compiled, max_distance=2):
+        self.max_distance = max_distance
+        self.decode = compiled.decode
+        self.longest = max(len(code) for code in compiled.decode)
+        self.buckets = {}
+        for code in compiled.decode:
+            if code == WORD_SEPARATOR:
+                continue
+            for variant in _deletions(code, max_distance):
+                self.buckets.setdefault(variant, set()).add(code)
+        self._cache = {}
+
+    def lookup(self, symbol):
+        """Nearest symbols as [(char, confidence), ...], best first"""
+        if symbol in self._cache:
+            return self._cache[symbol]
+        if len(symbol) > self.longest + self.max_distance:
+            return []
+
+        candidates = set()
+        for variant in _deletions(symbol, self.max_distance):
+            candidates |= self.buckets.get(variant, set())
+
+        scored = []
+        for code in candidates:
+            distance = edit_distance(symbol, code)
+            if distance <= self.max_distance:
+                scored.append((distance, code))
+        scored.sort(key=lambda item: (item[0], len(item[1]), item[1]))
+
+        # Leave some probability for "none of these" so corrections never score 1.0
+        weights = [FUZZY_EDIT_WEIGHT ** distance for distance, _ in scored]
+        total = sum(weights) + FUZZY_EDIT_WEIGHT ** (self.max_distance + 1)
+        result = [(self.decode[code], weight / total) for (_, code), weight in zip(scored, weights)]
+
+        if len(self._cache) >= FUZZY_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[symbol] = result
+        return result
+
+
+_FUZZY_INDEXES = {}
+
+
+def fuzzy_index(table=None, max_distance=2):
+    """Return the (cached) FuzzyIndex for a code table"""
+    compiled = get_code_table(table)
+    key = (compiled.name, max_distance)
+    if key not in _FUZZY_INDEXES:
+        _FUZZY_INDEXES[key] = FuzzyIndex(compiled, max_distance)
+    return _FUZZY_INDEXES[key]
+
+# --- Segmentation of Unspaced Morse ---
+# English letter frequencies (percent), the default letter model for segmentation
+LETTER_FREQUENCIES = {
+    'E': 12.7, 'T': 9.1, 'A': 8.2, 'O': 7.5, 'I': 7.0, 'N': 6.7, 'S': 6.3,
+    'H': 6.1, 'R': 6.0, 'D': 4.3, 'L': 4.0, 'C': 2.8, 'U': 2.8, 'M': 2.4,
+    'W': 2.4, 'F': 2.2, 'G': 2.0, 'Y': 2.0, 'P': 1.9, 'B': 1.5, 'V': 1.0,
+    'K': 0.8, 'J': 0.15, 'X': 0.15, 'Q': 0.1, 'Z': 0.07
+}
+RARE_SYMBOL_FREQUENCY = 0.01  # for table symbols missing from the letter model
+UNKNOWN_SPAN_PENALTY = -50.0  # log-score for a span no code can cover
+OOV_LETTER_PENALTY = math.log(1e-3)  # per letter of a word outside the word model
+DEFAULT_BEAM_WIDTH = 16
+
+
+class CodeTrie:
+    """Trie over a code table's element strings"""
+    def __init__(self, compiled):
+        self.root = {}
+        self.longest = 0
+        for code, char in compiled.decode.items():
+            if code == WORD_SEPARATOR:
+                continue
+            node = self.root
+            for element in code:
+                node = node.setdefault(element, {})
+            node[None] = char
+            self.longest = max(self.longest, len(code))
+
+    def matches(self, elements, start, stop):
+        """Yield (end, char) for every code spelling elements[start:end], end <= stop"""
+        node = self.root
+        for end in range(start, min(stop, start + self.longest)):
+            node = node.get(elements[end])
+            if node is None:
+                return
+            if None in node:
+                yield end + 1, node[None]
+
+
+_CODE_TRIES = {}
+
+
+def code_trie(table=None):
+    """Return the (cached) CodeTrie for a code table"""
+    compiled = get_code_table(table)
+    if compiled.name not in _CODE_TRIES:
+        _CODE_TRIES[compiled.name] = CodeTrie(compiled)
+    return _CODE_TRIES[compiled.name]
+
+
+def _letter_scores(compiled, letter_model):
+    """Log-probability of each decodable symbol under a frequency model"""
+    chars = [char for code, char in compiled.decode.items() if code != WORD_SEPARATOR]
+    known = [char for char in chars if char in letter_model]
+    if not known:  # model does not cover this alphabet: treat symbols alike
+        return {char: -math.log(len(chars)) for char in chars}
+    weights = {char: letter_model.get(char, RARE_SYMBOL_FREQUENCY) for char in chars}
+    total = sum(weights.values())
+    return {char: math.log(weight / total) for char, weight in weights.items()}
+
+
+def segment_morse(code, table=None, word_model=None, letter_model=None,
+                  beam_width=DEFAULT_BEAM_WIDTH, infer_word_gaps=None):
+    """Decode Morse whose letter gaps are partly or wholly missing
+
+    Spaces and '/' that are present are kept as hard letter and word
+    boundaries; runs between them are split into the most likely letters.
+    Without a ``word_model`` (word -> count) this is a Viterbi search over
+    the code trie scored by ``letter_model``. With one, a beam of at most
+    ``beam_width`` hypotheses per position also tracks the word being
+    spelled, and (when ``infer_word_gaps``, the default if the input has no
+    '/') may end words wherever a known word completes. Either way every
+    element position is visited once, so cost grows linearly with input.
+    """
+    compiled = get_code_table(table)
+    trie = code_trie(compiled)
+    letter_scores = _letter_scores(compiled, LETTER_FREQUENCIES if letter_model is None else letter_model)
+
+    # Flatten into one element string with hard boundary positions
+    elements = []
+    letter_breaks, word_breaks = set(), set()
+    for word in code.split(WORD_SEPARATOR):
+        if elements:
+            word_breaks.add(len(elements))
+        for token in word.split():
+            letter_breaks.add(len(elements))
+            elements.extend(token)
+    elements = ''.join(elements)
+    size = len(elements)
+    letter_breaks |= word_breaks | {size}
+
+    next_break = [size] * (size + 1)
+    upcoming = size
+    for pos in range(size, -1, -1):
+        next_break[pos] = upcoming
+        if pos in letter_breaks:
+            upcoming = pos
+
+    if word_model:
+        word_total = sum(word_model.values())
+        word_scores = {word.upper(): math.log(count / word_total) for word, count in word_model.items()}
+        prefixes = {word[:i] for word in word_scores for i in range(1, len(word) + 1)}
+        if infer_word_gaps is None:
+            infer_word_gaps = not word_breaks
+    else:
+        word_scores, prefixes, infer_word_gaps = None, None, False
+
+    def close_word(score, word):
+        if word_scores is None or not word:
+            return score
+        if word in word_scores:
+            return score + word_scores[word]
+        return score + OOV_LETTER_PENALTY * len(word)
+
+    # beams[pos]: {word key: (score, word so far, back-pointer to decoded text)}
+    # The word key is the partial word while it can still become a known
+    # word, and None once it cannot; hypotheses sharing a key recombine.
+    beams = [None] * (size + 1)
+    beams[0] = {'': (0.0, '', None)}
+
+    def offer(pos, key, score, word, text):
+        beam = beams[pos]
+        if beam is None:
+            beam = beams[pos] = {}
+        if key not in beam or beam[key][0] < score:
+            beam[key] = (score, word, text)
+
+    for pos in range(size + 1):
+        beam = beams[pos]
+        if not beam:
+            continue
+        if len(beam) > beam_width:
+            beam = dict(sorted(beam.items(), key=lambda item: -item[1][0])[:beam_width])
+
+        if pos in word_breaks or pos == size:
+            closed = {}
+            for score, word, text in beam.values():
+                score = close_word(score, word)
+                if '' not in closed or closed[''][0] < score:
+                    closed[''] = (score, '', (text, ' ') if pos < size else text)
+            beam = closed
+        elif infer_word_gaps:
+            for score, word, text in list(beam.values()):
+                if word in word_scores:
+                    key = ''
+                    if key not in beam or beam[key][0] < score + word_scores[word]:
+                        beam[key] = (score + word_scores[word], '', (text, ' '))
+
+        if pos == size:
+            beams[pos] = beam
+            break
+
+        stop = next_break[pos]
+        found = False
+        for end, char in trie.matches(elements, pos, stop):
+            found = True
+            for score, word, text in beam.values():
+                new_word = word + char if word_scores is not None else ''
+                key = new_word if prefixes is None or new_word in prefixes else None
+                offer(end, key, score + letter_scores[char], new_word, (text, char))
+        if not found:
+            for score, word, text in beam.values():
+                offer(stop, None, score + UNKNOWN_SPAN_PENALTY, word + '�' if word_scores is not None else '', (text, '�'))
+
+    final = beams[size]
+    if not final:
+        return ''
+    _, _, text = max(final.values(), key=lambda state: state[0])
+    pieces = []
+    while text is not None:
+        text, piece = text
+        pieces.append(piece)
+    return ''.join(reversed(pieces)).strip()
+
+# --- Bulk File Encoding ---
+ENCODE_CHUNK_BYTES = 4 << 20
+
+
+def _chunk_bounds(data, chunk_size):
+    """Byte offsets that split ``data`` into ~chunk_size pieces at whitespace
+
+    Prefers the last newline in each window, then the last space, and
+    otherwise any UTF-8 character boundary that does not split a CR LF.
+    """
+    bounds = [0]
+    size = len(data)
+    while size - bounds[-1] > chunk_size:
+        start = bounds[-1]
+        target = start + chunk_size
+        cut = data.rfind(b'\n', start + chunk_size // 2, target) + 1
+        if not cut:
+            cut = data.rfind(b' ', start + chunk_size // 2, target) + 1
+        if not cut:
+            cut = target
+            while cut > start + 1 and ((data[cut] & 0xC0) == 0x80 or data[cut - 1:cut + 1] == b'\r\n'):
+                cut -= 1
+        bounds.append(cut)
+    bounds.append(size)
+    return bounds
+
+
+def _encode_span(path, start, stop, table):
+    """Worker: encode bytes [start, stop) of a UTF-8 text file via its own memory map"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:stop].decode('utf-8')
+    # Same universal-newline handling as reading the file in text mode
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return letters_to_morse(text, table).encode('utf-8')
+
+
+def encode_file(source, destination, table=None, workers=None, chunk_size=ENCODE_CHUNK_BYTES):
+    """Encode a UTF-8 text file to a Morse file without loading it whole
+
+    The source is memory-mapped and cut at whitespace into chunks that a
+    process pool encodes; results are written in order with a ' ' at each
+    seam, so the output equals ``letters_to_morse`` of the whole text. At
+    most two chunks per worker are in flight, which bounds memory use.
+    """
+    source = os.fspath(source)
+    workers = workers or os.cpu_count() or 1
+    with open(source, 'rb') as f, open(destination, 'wb') as out:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            bounds = _chunk_bounds(data, chunk_size)
+
+        spans = iter(zip(bounds[:-1], bounds[1:]))
+        pending = deque()
+        wrote = False
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                while len(pending) < 2 * workers:
+                    span = next(spans, None)
+                    if span is None:
+                        break
+                    pending.append(pool.submit(_encode_span, source, *span, table))
+                if not pending:
+                    break
+                encoded = pending.popleft().result()
+                if encoded:
+                    if wrote:
+                        out.write(b' ')
+                    out.write(encoded)
+                    wrote = True
+
+# --- Timing & WAV Rendering ---
+DEFAULT_WPM = 12
+DEFAULT_FREQUENCY = 800
+SAMPLE_RATE = 44100
+
+# Length in dot units of each keyed element, and of each gap that follows
+ELEMENT_UNITS = {'.': 1, '-': 3, '⸺': 5, '⸻': 7}
+ELEMENT_GAP_UNITS = 1
+LETTER_GAP_UNITS = 3
+WORD_GAP_UNITS = 7
+SPACED_GAP_UNITS = 2  # extra gap marked by '_' inside American letters
+
+
+def unit_seconds(wpm=DEFAULT_WPM):
+    """Length of one dot in seconds at ``wpm`` (PARIS timing)"""
+    return 1.2 / wpm
+
+
+def morse_timeline(code):
+    """Turn Morse code into a list of (key_down, units) runs
+
+    Consecutive runs never share the same key state, and the list neither
+    starts nor ends with silence.
+    """
+    runs = []
+
+    def add(key_down, units):
+        if runs and runs[-1][0] == key_down:
+            runs[-1] = (key_down, runs[-1][1] + units)
+        elif runs or key_down:
+            runs.append((key_down, units))
+
+    for word in code.split(WORD_SEPARATOR):
+        if runs:
+            add(False, WORD_GAP_UNITS)
+        for letter in word.split():
+            if runs and runs[-1][0]:
+                add(False, LETTER_GAP_UNITS)
+            for element in letter:
+                if element == '_':
+                    add(False, SPACED_GAP_UNITS)
+                elif element in ELEMENT_UNITS:
+                    if runs and runs[-1][0]:
+                        add(False, ELEMENT_GAP_UNITS)
+                    add(True, ELEMENT_UNITS[element])
+    if runs and not runs[-1][0]:
+        runs.pop()
+    return runs
+
+
+def render_pcm(code, wpm=DEFAULT_WPM, frequency=DEFAULT_FREQUENCY,
+               sample_rate=SAMPLE_RATE, amplitude=0.8):
+    """Render Morse code as mono 16-bit little-endian PCM bytes"""
+    unit = int(sample_rate * unit_seconds(wpm))
+    ramp = min(unit // 4, int(sample_rate * 0.005))  # soften key clicks
+    tones = {}
+    chunks = []
+    for key_down, units in morse_timeline(code):
+        if not key_down:
+            chunks.append(bytes(2 * units * unit))
+            continue
+        if units not in tones:
+            count = units * unit
+            peak = 32767.0 * amplitude
+            step = 2.0 * math.pi * frequency / sample_rate
+            samples = []
+            for s in range(count):
+                edge = min(s, count - 1 - s)
+                gain = edge / ramp if ramp and edge < ramp else 1.0
+                samples.append(int(peak * gain * math.sin(step * s)))
+            tones[units] = struct.pack(f"<{count}h", *samples)
+        chunks.append(tones[units])
+    return b''.join(chunks)
+
+
+def render_wav(code, wpm=DEFAULT_WPM, frequency=DEFAULT_FREQUENCY,
+               sample_rate=SAMPLE_RATE):
+    """Render Morse code as the bytes of a mono 16-bit WAV file"""
+    out = io.BytesIO()
+    with wave.open(out, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(render_pcm(code, wpm, frequency, sample_rate))
+    return out.getvalue()
+
+# --- Unit Tests ---
+class TestCodeTables(unittest.TestCase):
+    def test_default_table_matches_dicts(self):
+        table = get_code_table()
+        self.assertEqual(table.name, DEFAULT_CODE_TABLE)
+        self.assertIs(table.decode, REVERSE_MORSE_DICT)
+        self.assertEqual(table.encode['A'], MORSE_CODE_DICT['A'])
+    
+    def test_tables_compile_once(self):
+        for name in CODE_TABLES:
+            self.assertIs(get_code_table(name), get_code_table(name))
+    
+    def test_round_trip_per_table(self):
+        self.assertEqual(morse_to_letters(letters_to_morse("Привет мир", "Cyrillic"), "Cyrillic"), "ПРИВЕТ МИР")
+        self.assertEqual(morse_to_letters(letters_to_morse("ΟΡΑΚΛΟ", "Greek"), "Greek"), "ΟΡΑΚΛΟ")
+        self.assertEqual(letters_to_morse("イロハ", "Wabun"), ".- .-.- -...")
+        self.assertEqual(letters_to_morse("COL", "American"), ".._. ._. ⸺")
+        self.assertEqual(morse_to_letters(".._. ._. ⸺", "American"), "COL")
+    
+    def test_aliases_encode_to_canonical_code(self):
+        self.assertEqual(letters_to_morse("Ё", "Cyrillic"), letters_to_morse("Е", "Cyrillic"))
+        self.assertEqual(letters_to_morse("いろは", "Wabun"), letters_to_morse("イロハ", "Wabun"))
+        self.assertEqual(morse_to_letters(".", "Cyrillic"), "Е")
+    
+    def test_ambiguous_table_rejected_at_compile(self):
+        table = CodeTable("Clash", {'Ø': '---.', 'Ö': '---.'})
+        with self.assertRaises(ValueError):
+            table.compile()
+    
+    def test_unknown_table(self):
+        with self.assertRaises(KeyError):
+            letters_to_morse("SOS", "Klingon")
+
+
+class TestRendering(unittest.TestCase):
+    def test_timeline(self):
+        self.assertEqual(morse_timeline(". -"), [(True, 1), (False, 3), (True, 3)])
+        self.assertEqual(morse_timeline(".. / -"), [(True, 1), (False, 1), (True, 1), (False, 7), (True, 3)])
+        self.assertEqual(morse_timeline(".._."), [(True, 1), (False, 1), (True, 1), (False, 2), (True, 1)])
+        self.assertEqual(morse_timeline(""), [])
+    
+    def test_render_wav_length(self):
+        wav_bytes = render_wav("... --- ...", wpm=20, sample_rate=8000)
+        with wave.open(io.BytesIO(wav_bytes)) as wav:
+            units = sum(u for _, u in morse_timeline("... --- ..."))
+            self.assertEqual(wav.getnchannels(), 1)
+            self.assertEqual(wav.getnframes(), units * int(8000 * unit_seconds(20)))
+
+
+class TestFuzzyDecoding(unittest.TestCase):
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance("...", "..."), 0)
+        self.assertEqual(edit_distance("...", "..-"), 1)
+        self.assertEqual(edit_distance("-.-.", ".-"), 2)
+    
+    def test_index_matches_brute_force(self):
+        index = fuzzy_index(max_distance=2)
+        decode = get_code_table().decode
+        for symbol in ["........", ".-.-.-.-", "--.-..", "-------", "..-.-."]:
+            expected = {decode[c] for c in decode if c != WORD_SEPARATOR and edit_distance(symbol, c) <= 2}
+            self.assertEqual({char for char, _ in index.lookup(symbol)}, expected)
+    
+    def test_confidences(self):
+        candidates = fuzzy_index(max_distance=1).lookup("...---...")
+        self.assertEqual(candidates, [])
+        candidates = fuzzy_index(max_distance=1).lookup("----.-")
+        self.assertLess(sum(conf for _, conf in candidates), 1.0)
+        self.assertEqual(candidates, sorted(candidates, key=lambda c: -c[1]))
+    
+    def test_fuzzy_decode(self):
+        self.assertEqual(morse_to_letters("... ---- ...", max_distance=0), "S�S")
+        self.assertEqual(morse_to_letters("... ---- ...", max_distance=1)[0], "S")
+        self.assertNotIn('�', morse_to_letters("... ---- ...", max_distance=1))
+        decoded = decode_with_confidence(".... .. / ......-", max_distance=1)
+        self.assertEqual([char for char, _ in decoded[:4]], ['H', 'I', ' ', '$'])
+        self.assertLess(decoded[3][1], 1.0)
+
+
+class TestSegmentation(unittest.TestCase):
+    def test_spaced_input_is_unchanged(self):
+        self.assertEqual(segment_morse(".... . .-.. .-.. --- / .-- --- .-. .-.. -.."), "HELLO WORLD")
+    
+    def test_gapless_letters(self):
+        self.assertEqual(segment_morse("...---..."), "SOS")
+    
+    def test_partial_spacing_keeps_known_gaps(self):
+        self.assertEqual(segment_morse("... ---..."), "SOS")
+        self.assertEqual(segment_morse(". ."), "EE")
+    
+    def test_word_model_restores_words(self):
+        words = {'HELLO': 50, 'WORLD': 40, 'THE': 500, 'ORACLE': 10, 'SPEAKS': 10}
+        gapless = letters_to_morse("the oracle speaks").replace(' ', '').replace(WORD_SEPARATOR, '')
+        self.assertEqual(segment_morse(gapless, word_model=words), "THE ORACLE SPEAKS")
+    
+    def test_long_input_is_linear(self):
+        words = {'THE': 500, 'ORACLE': 10, 'SPEAKS': 10}
+        gapless = letters_to_morse("the oracle speaks " * 200).replace(' ', '').replace(WORD_SEPARATOR, '')
+        self.assertEqual(segment_morse(gapless, word_model=words), " ".join(["THE ORACLE SPEAKS"] * 200))
+    
+    def test_undecodable_span(self):
+        self.assertEqual(segment_morse("........ ."), "HHE")
+        self.assertEqual(segment_morse("x ."), "�E")
+
+
+class TestFileEncoding(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.folder.name, "scroll.txt")
+        self.destination = os.path.join(self.folder.name, "scroll.morse")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def _check(self, text, **options):
+        with open(self.source, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        encode_file(self.source, self.destination, **options)
+        with open(self.source, encoding='utf-8') as f:
+            expected = letters_to_morse(f.read(), options.get('table'))
+        with open(self.destination, encoding='utf-8') as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_matches_single_call(self):
+        self._check("The Oracle speaks\nof dots and dashes ñ é\r\n" * 200, workers=2, chunk_size=97)
+
+    def test_chunks_without_whitespace(self):
+        self._check("ÅÑßçØ" * 300, workers=2, chunk_size=64)
+
+    def test_empty_and_small_files(self):
+        self._check("")
+        self._check("SOS")
+        self._check("Привет мир\n" * 50, table="Cyrillic", chunk_size=50)
+
+    def test_chunk_bounds_respect_characters(self):
+        data = "é\r\n".encode('utf-8') * 100
+        for start, stop in zip(_chunk_bounds(data, 7)[:-1], _chunk_bounds(data, 7)[1:]):
+            data[start:stop].decode('utf-8')
+            self.assertNotEqual(data[stop - 1:stop + 1], b'\r\n')
+
+
+class TestUnicodeFolding(unittest.TestCase):
+    def test_accents_and_case(self):
+        self.assertEqual(letters_to_morse("café"), letters_to_morse("CAFE"))
+        self.assertEqual(letters_to_morse("Über"), letters_to_morse("UBER"))
+        self.assertEqual(letters_to_morse("ﬁＡ"), letters_to_morse("FIA"))
+    
+    def test_table_letters_preserved(self):
+        self.assertEqual(letters_to_morse("ñ"), MORSE_CODE_DICT['Ñ'])
+        self.assertEqual(letters_to_morse("å"), MORSE_CODE_DICT['Å'])
+        self.assertEqual(letters_to_morse("ß"), MORSE_CODE_DICT['ß'])
+        self.assertEqual(letters_to_morse("ẞ"), MORSE_CODE_DICT['ß'])
+        self.assertEqual(letters_to_morse("Ææ"), f"{MORSE_CODE_DICT['Æ']} {MORSE_CODE_DICT['Æ']}")
+        self.assertEqual(letters_to_morse("й", "Cyrillic"), CYRILLIC_MORSE_DICT['Й'])
+        self.assertEqual(letters_to_morse("ガ", "Wabun"), letters_to_morse("カ゛", "Wabun"))
+    
+    def test_letters_without_decomposition(self):
+        self.assertEqual(letters_to_morse("Œuvre"), letters_to_morse("OEUVRE"))
+        self.assertEqual(letters_to_morse("œ Łódź Þór"), letters_to_morse("OE LODZ THOR"))
+        self.assertEqual(letters_to_morse("ß", "American"), letters_to_morse("SS", "American"))
+        self.assertNotIn(UNKNOWN_SYMBOL, letters_to_morse("ŉ Đ ı"))
+    
+    def test_punctuation_and_spaces(self):
+        self.assertEqual(letters_to_morse("“Hi”\u00a0—\u2019"), letters_to_morse('"HI" -\''))
+        self.assertEqual(letters_to_morse("A…"), letters_to_morse("A..."))
+        self.assertEqual(letters_to_morse("A\u00adB"), letters_to_morse("AB"))
+        self.assertEqual(letters_to_morse("A\nB"), ".- / -...")
+    
+    def test_symbols_outside_the_common_blocks(self):
+        self.assertEqual(letters_to_morse("1−2"), letters_to_morse("1-2"))
+        self.assertEqual(letters_to_morse("\ufeffA"), ".-")
+        self.assertEqual(letters_to_morse("™ №"), letters_to_morse("TM NO"))
+        self.assertEqual(letters_to_morse("Ω", "Greek"), letters_to_morse("ω", "Greek"))
+        self.assertEqual(letters_to_morse("Ⅻ½"), letters_to_morse("XII1/2"))
+        for char in PUNCTUATION_FOLDS.keys() | LETTER_FOLDS.keys():
+            self.assertNotIn(UNKNOWN_SYMBOL, letters_to_morse(char), char)
+    
+    def test_unknown_and_empty(self):
+        self.assertEqual(letters_to_morse("A\U0001F600B"), ".- � -...")
+        self.assertEqual(letters_to_morse(""), "")
+        self.assertEqual(letters_to_morse("\u200b"), "")
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--encode-file":
+        encode_file(sys.argv[2], sys.argv[3])
+    else:
+        print("Usage: python morse_core.py --encode-file SOURCE.txt DESTINATION.morse")
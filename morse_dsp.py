@@ -0,0 +1,805 @@
+import os
+import struct
+import tempfile
+import unittest
+import wave
+from unittest.mock import patch
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from morse_core import (
+    DEFAULT_WPM, DEFAULT_FREQUENCY, SAMPLE_RATE, LETTER_GAP_UNITS,
+    WORD_SEPARATOR, letters_to_morse, morse_to_letters, morse_timeline, unit_seconds
+)
+
+# --- Constants ---
+BLOCK_SIZE = 256
+RISE_TIME = 0.005  # seconds for the keying envelope to ramp fully on or off
+
+
+# --- Real-time Keying ---
+class KeyingFrameGenerator:
+    """Pull-based source of fixed-size mono int16 PCM blocks for live keying
+
+    Events are queued from any thread (a paddle, the keyboard, or text to
+    send) and consumed by whoever pulls frames, usually an audio callback.
+    The oscillator runs continuously and keying only moves a ramped
+    envelope, so block boundaries and key transitions never click.
+    """
+    def __init__(self, frequency=DEFAULT_FREQUENCY, sample_rate=SAMPLE_RATE,
+                 block_size=BLOCK_SIZE, wpm=DEFAULT_WPM, amplitude=0.8,
+                 rise_time=RISE_TIME, table=None):
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.amplitude = amplitude
+        self.table = table
+        self.wpm = wpm
+        self.events = deque()  # (key_down, samples); None samples = hold until next event
+        self._step = 2.0 * np.pi * frequency / sample_rate
+        self._slope = 1.0 / max(1, int(rise_time * sample_rate))
+        self._phase = 0.0
+        self._gain = 0.0
+        self._key_down = False
+        self._remaining = None
+        self._ramp = np.arange(1, block_size + 1, dtype=np.float64)
+        self._envelope = np.empty(block_size, dtype=np.float64)
+        self._out = np.empty(block_size, dtype=np.int16)
+
+    @property
+    def unit_samples(self):
+        return int(self.sample_rate * unit_seconds(self.wpm))
+
+    @property
+    def idle(self):
+        """True once every queued event has played and the envelope is silent"""
+        return not self.events and not self._key_down and self._remaining is None and self._gain == 0.0
+
+    def key_down(self):
+        """Straight-key press: tone until the next event"""
+        self.events.append((True, None))
+
+    def key_up(self):
+        """Straight-key release: silence until the next event"""
+        self.events.append((False, None))
+
+    def send_code(self, code):
+        """Queue Morse code for timed keying at the current speed"""
+        unit = self.unit_samples
+        if self.events or self._remaining:
+            self.events.append((False, LETTER_GAP_UNITS * unit))
+        for key_down, units in morse_timeline(code):
+            self.events.append((key_down, units * unit))
+
+    def send(self, text):
+        """Queue text for timed keying at the current speed"""
+        self.send_code(letters_to_morse(text, self.table))
+
+    def clear(self):
+        """Drop queued events and release the key"""
+        self.events.clear()
+        self._key_down = False
+        self._remaining = None
+
+    def _advance(self):
+        """Move on to the next queued event, or idle with the key up"""
+        if self.events:
+            self._key_down, self._remaining = self.events.popleft()
+        else:
+            self._key_down, self._remaining = False, None
+
+    def fill(self, out):
+        """Render the next ``len(out)`` samples into an int16 buffer"""
+        count = len(out)
+        if count > len(self._ramp):
+            self._ramp = np.arange(1, count + 1, dtype=np.float64)
+            self._envelope = np.empty(count, dtype=np.float64)
+        envelope = self._envelope[:count]
+
+        pos = 0
+        while pos < count:
+            if self._remaining is None or self._remaining == 0:
+                if self._remaining == 0 or self.events:
+                    self._advance()
+            run = count - pos if self._remaining is None else min(self._remaining, count - pos)
+
+            # Ramp toward the key state, then hold
+            target = 1.0 if self._key_down else 0.0
+            ramp = self._ramp[:run] * self._slope
+            if target > self._gain:
+                np.minimum(self._gain + ramp, target, out=envelope[pos:pos + run])
+            else:
+                np.maximum(self._gain - ramp, target, out=envelope[pos:pos + run])
+            self._gain = float(envelope[pos + run - 1])
+
+            if self._remaining is not None:
+                self._remaining -= run
+            pos += run
+
+        phases = self._phase + self._step * self._ramp[:count]
+        samples = np.sin(phases - self._step)
+        samples *= envelope
+        samples *= 32767.0 * self.amplitude
+        out[:] = samples
+        self._phase = float(phases[-1]) % (2.0 * np.pi)
+        return out
+
+    def next_frame(self):
+        """Return the next block; the array is reused on the following call"""
+        return self.fill(self._out)
+
+    def frames(self, count=None):
+        """Yield ``count`` blocks (forever when None)"""
+        while count is None or count > 0:
+            yield self.next_frame()
+            if count is not None:
+                count -= 1
+
+    def audio_callback(self, device, stream):
+        """SDL audio callback: fill ``stream`` (raw int16 mono bytes) in place
+
+        Matches the ``callback`` signature of ``pygame._sdl2.audio.AudioDevice``
+        opened with AUDIO_S16, one channel and ``chunksize=block_size``.
+        """
+        self.fill(np.frombuffer(stream, dtype=np.int16))
+
+
+# --- Pile-up Mixing ---
+MIX_BLOCK_SECONDS = 1.0
+
+
+class Station:
+    """One simulated transmitter in a pile-up"""
+    def __init__(self, text=None, code=None, frequency=DEFAULT_FREQUENCY, wpm=DEFAULT_WPM,
+                 amplitude=0.5, start=0.0, qsb_depth=0.0, qsb_rate=0.2, table=None):
+        self.code = code if code is not None else letters_to_morse(text or "", table)
+        self.frequency = frequency
+        self.wpm = wpm
+        self.amplitude = amplitude
+        self.start = start
+        self.qsb_depth = qsb_depth  # 0..1 fraction of amplitude lost at the bottom of a fade
+        self.qsb_rate = qsb_rate  # fades per second
+
+    def transitions(self, sample_rate):
+        """Sample indices where the key alternately goes down and up
+
+        Empty for code that never keys (no text, only unknown symbols or gaps).
+        """
+        timeline = morse_timeline(self.code)
+        if not timeline:
+            return np.zeros(0, dtype=np.int64)
+        unit = int(sample_rate * unit_seconds(self.wpm))
+        edges = np.cumsum([0] + [units * unit for _, units in timeline])
+        return edges + int(self.start * sample_rate)
+
+
+class PileUpMixer:
+    """Render many Morse stations into one mono stream
+
+    Every station is processed together per block: keying envelopes come
+    from one searchsorted over all stations' key transitions, and tones,
+    QSB fading and noise are whole-array operations, so cost scales with
+    stations x samples in NumPy with no per-sample Python.
+    """
+    def __init__(self, stations, sample_rate=SAMPLE_RATE, noise_level=0.0,
+                 rise_time=RISE_TIME, block_seconds=MIX_BLOCK_SECONDS, seed=None):
+        self.stations = list(stations)
+        self.sample_rate = sample_rate
+        self.noise_level = noise_level
+        self.block_size = max(1, int(block_seconds * sample_rate))
+        self._rise = max(1, int(rise_time * sample_rate))
+        self._rng = np.random.default_rng(seed)
+
+        count = len(self.stations)
+        transitions = [station.transitions(sample_rate) for station in self.stations]
+        self.length = max((int(t[-1]) for t in transitions if len(t)), default=0) + self._rise
+        # Offset each station's transitions into its own range so one sorted
+        # array (and one searchsorted) serves every station
+        self._stride = self.length + 1
+        self._offsets = (np.arange(count) * self._stride)[:, None]
+        self._edges = np.concatenate(
+            [t + i * self._stride for i, t in enumerate(transitions)]
+        ) if count else np.zeros(0, dtype=np.int64)
+        self._first = np.cumsum([0] + [len(t) for t in transitions])[:-1][:, None]
+
+        self._frequency = np.array([s.frequency for s in self.stations], dtype=np.float64)[:, None]
+        self._amplitude = np.array([s.amplitude for s in self.stations], dtype=np.float64)[:, None]
+        self._qsb_depth = np.array([s.qsb_depth for s in self.stations], dtype=np.float64)[:, None]
+        self._qsb_rate = np.array([s.qsb_rate for s in self.stations], dtype=np.float64)[:, None]
+        self._phase = self._rng.uniform(0, 2 * np.pi, (count, 1))
+        self._qsb_phase = self._rng.uniform(0, 2 * np.pi, (count, 1))
+
+    @property
+    def duration(self):
+        return self.length / self.sample_rate
+
+    def _envelopes(self, t):
+        """(stations, samples) keying envelopes with ramped edges"""
+        if not len(self._edges):
+            return np.zeros((len(self.stations), len(t)))
+        positions = np.minimum(t, self.length)[None, :] + self._offsets  # stay in each station's range
+        index = np.searchsorted(self._edges, positions, side='right')
+        passed = index - self._first  # transitions this station has passed
+        key_down = (passed % 2) == 1
+        last_edge = self._edges[np.maximum(index - 1, 0)]
+        since = np.where(passed > 0, positions - last_edge, self._rise)
+        ramp = np.minimum(since / self._rise, 1.0)
+        return np.where(key_down, ramp, 1.0 - ramp)
+
+    def blocks(self, duration=None):
+        """Yield successive float64 blocks in -1..1 (clipped)"""
+        total = self.length if duration is None else int(duration * self.sample_rate)
+        for start in range(0, total, self.block_size):
+            t = np.arange(start, min(start + self.block_size, total))
+            seconds = t / self.sample_rate
+            signal = self._envelopes(t)
+            signal *= np.sin(2 * np.pi * self._frequency * seconds + self._phase)
+            gain = self._amplitude * (1.0 - self._qsb_depth * 0.5 * (
+                1.0 + np.sin(2 * np.pi * self._qsb_rate * seconds + self._qsb_phase)))
+            signal *= gain
+            block = signal.sum(axis=0)
+            if self.noise_level:
+                block += self._rng.normal(0.0, self.noise_level, len(t))
+            yield np.clip(block, -1.0, 1.0, out=block)
+
+    def render(self, duration=None):
+        """Render the whole mix as mono int16"""
+        total = self.length if duration is None else int(duration * self.sample_rate)
+        out = np.empty(total, dtype=np.int16)
+        pos = 0
+        for block in self.blocks(duration):
+            np.multiply(block, 32767, out=block)
+            out[pos:pos + len(block)] = block
+            pos += len(block)
+        return out
+
+    def write_wav(self, path, duration=None):
+        """Stream the mix to a mono 16-bit WAV file, one block at a time"""
+        pcm = np.empty(self.block_size, dtype='<i2')
+        with wave.open(str(path), 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            for block in self.blocks(duration):
+                np.multiply(block, 32767, out=block)
+                frames = pcm[:len(block)]
+                frames[:] = block
+                wav.writeframes(frames)  # buffer protocol, no bytes copy
+
+
+# --- Skimmer (FFT Channelizer) ---
+SKIM_BIN_WIDTH = 30.0  # Hz per FFT bin, whatever the sample rate
+SKIM_SNR = 6.0  # how far above the noise floor a bin must peak to count as a signal
+SKIM_MIN_SEPARATION = 2  # bins between distinct channels
+SKIM_DYNAMIC_RANGE = 100.0  # peaks this far under the strongest are key-click splatter
+
+
+class ChannelTranscript:
+    """Decoded output of one detected signal"""
+    __slots__ = ("frequency", "code", "text")
+
+    def __init__(self, frequency, code, text):
+        self.frequency = frequency
+        self.code = code
+        self.text = text
+
+    def __repr__(self):
+        return f"ChannelTranscript({self.frequency:.0f} Hz, {self.text!r})"
+
+
+def skim_frame_size(sample_rate, bin_width=SKIM_BIN_WIDTH):
+    """FFT frame length giving bins ``bin_width`` Hz wide at ``sample_rate``"""
+    return max(16, int(round(sample_rate / bin_width)))
+
+
+def stft_magnitude(audio, frame_size, hop=None):
+    """Magnitude spectrogram (frames, bins) from one windowed FFT pass"""
+    hop = hop or frame_size // 4
+    audio = np.asarray(audio, dtype=np.float32)
+    if len(audio) < frame_size:
+        audio = np.pad(audio, (0, frame_size - len(audio)))
+    frames = np.lib.stride_tricks.sliding_window_view(audio, frame_size)[::hop]
+    return np.abs(np.fft.rfft(frames * np.hanning(frame_size).astype(np.float32), axis=1))
+
+
+def detect_channels(magnitude, snr=SKIM_SNR, min_separation=SKIM_MIN_SEPARATION):
+    """Indices of bins carrying keyed tones, strongest local peaks only"""
+    return peak_channels(np.percentile(magnitude, 90, axis=0), np.median(magnitude, axis=0),
+                         snr, min_separation)
+
+
+def peak_channels(peak, floors, snr=SKIM_SNR, min_separation=SKIM_MIN_SEPARATION):
+    """Channel bins from per-bin peak and median levels (see ``detect_channels``)"""
+    floor = max(float(np.median(floors)), 1e-9)
+    # A channel is a bin that tops every bin within min_separation of it, so
+    # keying sidebands and window leakage around a strong tone are skipped
+    padded = np.pad(peak, min_separation)
+    local_max = np.lib.stride_tricks.sliding_window_view(padded, 2 * min_separation + 1).max(axis=1)
+    channels = (peak > snr * floor) & (peak >= local_max)
+    if channels.any():
+        channels &= peak * SKIM_DYNAMIC_RANGE > peak[channels].max()
+    return list(np.flatnonzero(channels))
+
+
+def keying_runs(key_down):
+    """Run-length encode a boolean keying track into (key_down, length) pairs"""
+    key_down = np.asarray(key_down, dtype=bool)
+    if not len(key_down):
+        return []
+    edges = np.flatnonzero(np.diff(key_down.view(np.int8))) + 1
+    bounds = np.concatenate(([0], edges, [len(key_down)]))
+    return [(bool(key_down[start]), int(end - start)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def estimate_unit(lengths):
+    """Dot length from keying run lengths: the median of the shortest cluster"""
+    lengths = np.asarray(lengths, dtype=np.float64)
+    shortest = np.percentile(lengths, 10)
+    return float(np.median(lengths[lengths < 2 * shortest]))
+
+
+def runs_to_code(runs):
+    """Classify keying runs into Morse code, estimating the dot length from the runs
+
+    Leading and trailing silence is ignored. The shortest cluster of runs
+    is taken as one unit, since element gaps are always a single unit.
+    """
+    while runs and not runs[0][0]:
+        runs = runs[1:]
+    while runs and not runs[-1][0]:
+        runs = runs[:-1]
+    if not runs:
+        return ""
+    unit = estimate_unit([length for _, length in runs])
+
+    code = []
+    for key_down, length in runs:
+        units = length / unit
+        if key_down:
+            code.append('.' if units < 2 else '-')
+        elif units >= 5:
+            code.append(f' {WORD_SEPARATOR} ')
+        elif units >= 2:
+            code.append(' ')
+    return ''.join(code)
+
+
+def keying_track(envelope):
+    """Threshold one channel's magnitude envelope into a boolean key-down track"""
+    low, high = np.percentile(envelope, [10, 90])
+    key_down = envelope > (low + high) / 2
+    # Debounce single-frame glitches with a 3-tap majority vote
+    if len(key_down) > 2:
+        key_down[1:-1] = (key_down[:-2].astype(np.int8) + key_down[1:-1] + key_down[2:]) >= 2
+    return key_down
+
+
+def decode_envelope(envelope, table=None):
+    """Decode one channel's magnitude envelope into (code, text)"""
+    code = runs_to_code(keying_runs(keying_track(envelope)))
+    return code, morse_to_letters(code, table)
+
+
+def skim(audio, sample_rate, table=None, frame_size=None, hop=None,
+         snr=SKIM_SNR, min_separation=SKIM_MIN_SEPARATION):
+    """Decode every CW signal in a recording from a single STFT pass
+
+    Yields a ChannelTranscript per detected tone, lowest frequency first.
+    The frame size defaults to SKIM_BIN_WIDTH Hz bins at ``sample_rate``,
+    so channel spacing is the same for 8 kHz and 44.1 kHz recordings.
+    """
+    frame_size = frame_size or skim_frame_size(sample_rate)
+    magnitude = stft_magnitude(audio, frame_size, hop)
+    bin_width = sample_rate / frame_size
+    for index in detect_channels(magnitude, snr, min_separation):
+        code, text = decode_envelope(magnitude[:, index], table)
+        if text:
+            yield ChannelTranscript(index * bin_width, code, text)
+
+
+# --- Parallel File Decoding ---
+SEGMENT_SECONDS = 60.0
+WORD_GAP_THRESHOLD = 5  # units of silence that separate words
+SCAN_CHUNK_FRAMES = 4096  # STFT frames read per chunk while scanning for cuts
+
+
+def open_wav_samples(path):
+    """Memory-map a 16-bit PCM WAV file as a (frames, channels) int16 array
+
+    Returns (samples, sample_rate). Nothing is read until the array is used.
+    """
+    with open(path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"Not a WAV file: {path}")
+        channels = sample_rate = bits = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"No audio data in WAV file: {path}")
+            chunk_id, size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                fmt = f.read(size)
+                audio_format, channels, sample_rate = struct.unpack('<HHI', fmt[:8])
+                bits = struct.unpack('<H', fmt[14:16])[0]
+                if audio_format != 1 or bits != 16:
+                    raise ValueError("Only 16-bit PCM WAV files can be decoded")
+            elif chunk_id == b'data':
+                if channels is None:
+                    raise ValueError(f"WAV data before format chunk: {path}")
+                offset = f.tell()
+                frames = size // (2 * channels)
+                break
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+    samples = np.memmap(path, dtype='<i2', mode='r', offset=offset, shape=(frames, channels))
+    return samples, sample_rate
+
+
+def _scan_piece(samples, frame_size, hop, first):
+    """Mono float32 samples of SCAN_CHUNK_FRAMES STFT frames from frame ``first``
+
+    Neighbouring pieces overlap by ``frame_size - hop`` samples so their
+    frames tile the recording exactly; memory stays bounded per chunk.
+    """
+    last = min(first + SCAN_CHUNK_FRAMES, 1 + (len(samples) - frame_size) // hop)
+    piece = np.asarray(samples[first * hop:(last - 1) * hop + frame_size])
+    return piece[:, 0].astype(np.float32) if piece.shape[1] == 1 else piece.mean(axis=1, dtype=np.float32)
+
+
+def _scan_levels(samples, frame_size, first):
+    """Per-bin 90th percentile and median of one chunk of non-overlapping frames"""
+    magnitude = stft_magnitude(_scan_piece(samples, frame_size, frame_size, first), frame_size, frame_size)
+    return np.percentile(magnitude, 90, axis=0), np.median(magnitude, axis=0)
+
+
+def _scan_envelopes(samples, frame_size, hop, bins, first):
+    """Magnitudes of just the channel bins over one chunk of overlapping frames"""
+    basis = np.exp(np.outer(np.arange(frame_size), bins) * (-2j * np.pi / frame_size))
+    basis = (basis * np.hanning(frame_size)[:, None]).astype(np.complex64)
+    piece = _scan_piece(samples, frame_size, hop, first)
+    return np.abs(np.lib.stride_tricks.sliding_window_view(piece, frame_size)[::hop] @ basis)
+
+
+def _scan_file(path, task, *args):
+    samples, _ = open_wav_samples(path)
+    return task(samples, *args)
+
+
+def _scan_chunks(samples, task, hop, frame_size, args, pool, path):
+    """Run ``task`` on every chunk of frames, in order, in the pool when given"""
+    firsts = range(0, max(1 + (len(samples) - frame_size) // hop, 0), SCAN_CHUNK_FRAMES)
+    if pool is None:
+        return [task(samples, *args, first) for first in firsts]
+    jobs = [pool.submit(_scan_file, path, task, *args, first) for first in firsts]
+    return [job.result() for job in jobs]
+
+
+def scan_channels(samples, sample_rate, snr=SKIM_SNR, min_separation=SKIM_MIN_SEPARATION,
+                  pool=None, path=None):
+    """Find every keyed channel in a long recording and its coarse envelope
+
+    Two chunked passes: the first collects per-bin peak and median levels
+    over non-overlapping STFT frames to detect channels as ``skim`` does;
+    the second measures only those bins, on half-overlapping frames, by
+    one matrix product per chunk. Given an executor ``pool`` and the WAV
+    ``path`` that ``samples`` maps, each chunk is scanned by a worker that
+    memory-maps the file itself; chunks end on whole frames, so the result
+    is identical to the serial scan. Returns (bins, envelopes, frame_size,
+    hop) with envelopes shaped (frames, channels).
+    """
+    frame_size = skim_frame_size(sample_rate)
+    hop = frame_size // 2
+    levels = _scan_chunks(samples, _scan_levels, frame_size, frame_size, (frame_size,), pool, path)
+    if not levels:
+        return [], np.zeros((0, 0)), frame_size, hop
+    peaks, floors = zip(*levels)
+    bins = peak_channels(np.max(peaks, axis=0), np.median(floors, axis=0), snr, min_separation)
+
+    envelopes = _scan_chunks(samples, _scan_envelopes, hop, frame_size, (frame_size, hop, bins), pool, path)
+    return bins, np.concatenate(envelopes) if envelopes else np.zeros((0, len(bins))), frame_size, hop
+
+
+def find_silence_cuts(samples, sample_rate, segment_seconds=SEGMENT_SECONDS, min_silence=None,
+                      snr=SKIM_SNR, min_separation=SKIM_MIN_SEPARATION, pool=None, path=None):
+    """Sample indices splitting a recording into pieces of at least ~segment_seconds
+
+    A cut lands only where every detected channel is between words: in a
+    silence of at least ``min_silence`` seconds, or by default five of that
+    channel's own dot lengths, or before its first or after its last
+    element. No channel's element or letter is split, however weak it is;
+    when the stations never pause together the recording is cut less often
+    (or not at all). ``pool`` and ``path`` spread the scan as in
+    ``scan_channels``.
+    """
+    bins, envelopes, frame_size, hop = scan_channels(samples, sample_rate, snr, min_separation, pool, path)
+    if not bins:
+        return []
+    between_words = np.ones(len(envelopes), dtype=bool)
+    for channel in range(len(bins)):
+        key_down = keying_track(envelopes[:, channel])
+        runs = list(_runs_with_starts(key_down))
+        if min_silence is None:
+            shortest = WORD_GAP_THRESHOLD * estimate_unit([length for _, length, _ in runs])
+        else:
+            shortest = min_silence * sample_rate / hop
+        gaps = np.zeros(len(key_down), dtype=bool)
+        for key_down_run, length, start in runs:
+            if not key_down_run and (length >= shortest or start == 0 or start + length == len(key_down)):
+                gaps[start:start + length] = True
+        between_words &= gaps
+
+    cuts = []
+    target = segment_seconds * sample_rate
+    for common, length, start in _runs_with_starts(between_words):
+        if not common or start == 0 or start + length == len(between_words):
+            continue
+        cut = (start + length // 2) * hop + frame_size // 2
+        if cut - (cuts[-1] if cuts else 0) >= target:
+            cuts.append(cut)
+    return cuts
+
+
+def _runs_with_starts(states):
+    start = 0
+    for state, length in keying_runs(states):
+        yield state, length, start
+        start += length
+
+
+def _skim_segment(path, start, stop, table, skim_options):
+    """Worker: decode frames [start, stop) of a WAV file via its own memory map"""
+    samples, sample_rate = open_wav_samples(path)
+    segment = samples[start:stop]
+    audio = segment[:, 0] if segment.shape[1] == 1 else segment.mean(axis=1)
+    return [(t.frequency, t.code, t.text) for t in skim(audio, sample_rate, table, **skim_options)]
+
+
+def decode_wav_file(path, table=None, workers=None, segment_seconds=SEGMENT_SECONDS,
+                    min_silence=None, **skim_options):
+    """Decode a long WAV recording across a process pool
+
+    The file is scanned and cut at word-gap silences, then decoded segment
+    by segment; for both steps each worker memory-maps the same file and
+    reads only its own frame range, so no PCM is copied between processes. Transcripts are stitched back in order per channel, matching
+    a segment's frequency to the nearest channel within the skimmer's
+    separation, so a tone landing one bin over in another segment stays
+    one transcript.
+    """
+    path = os.fspath(path)
+    samples, sample_rate = open_wav_samples(path)
+    snr = skim_options.get("snr", SKIM_SNR)
+    min_separation = skim_options.get("min_separation", SKIM_MIN_SEPARATION)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        bounds = [0] + find_silence_cuts(samples, sample_rate, segment_seconds, min_silence,
+                                         snr, min_separation, pool, path) + [len(samples)]
+        del samples
+        jobs = [pool.submit(_skim_segment, path, start, stop, table, skim_options)
+                for start, stop in zip(bounds[:-1], bounds[1:])]
+        segments = [job.result() for job in jobs]
+
+    frame_size = skim_options.get("frame_size") or skim_frame_size(sample_rate)
+    tolerance = min_separation * sample_rate / frame_size
+    channels = []  # [frequencies seen, codes, texts]
+    for transcripts in segments:
+        for frequency, code, text in transcripts:
+            nearest = min(channels, default=None, key=lambda c: abs(np.mean(c[0]) - frequency))
+            if nearest is None or abs(np.mean(nearest[0]) - frequency) > tolerance:
+                nearest = ([], [], [])
+                channels.append(nearest)
+            nearest[0].append(frequency)
+            nearest[1].append(code)
+            nearest[2].append(text)
+    channels.sort(key=lambda c: np.mean(c[0]))
+    return [ChannelTranscript(float(np.mean(frequencies)), f' {WORD_SEPARATOR} '.join(codes), ' '.join(texts))
+            for frequencies, codes, texts in channels]
+
+
+# --- Unit Tests ---
+class TestKeyingFrameGenerator(unittest.TestCase):
+    def setUp(self):
+        self.gen = KeyingFrameGenerator(sample_rate=8000, block_size=64, wpm=20)
+
+    def _pull(self, blocks):
+        return np.concatenate([frame.copy() for frame in self.gen.frames(blocks)])
+
+    def test_idle_is_silent(self):
+        self.assertTrue(self.gen.idle)
+        frame = self.gen.next_frame()
+        self.assertEqual(frame.shape, (64,))
+        self.assertFalse(frame.any())
+
+    def test_straight_key(self):
+        self.gen.key_down()
+        self.assertGreater(np.abs(self._pull(10)).max(), 20000)
+        self.gen.key_up()
+        self.assertFalse(self._pull(10)[-64:].any())
+        self.assertTrue(self.gen.idle)
+
+    def test_sent_text_keys_for_timeline_length(self):
+        self.gen.send("E")
+        audio = self._pull(20)
+        keyed = np.flatnonzero(audio)
+        release = int(RISE_TIME * 8000)
+        self.assertAlmostEqual(keyed[-1] - keyed[0], self.gen.unit_samples + release, delta=8)
+        self.assertTrue(self.gen.idle)
+
+    def test_phase_continuous_across_blocks(self):
+        self.gen.key_down()
+        audio = self._pull(40).astype(np.float64)
+        step = 2.0 * np.pi * 800 / 8000
+        max_jump = 32767.0 * 0.8 * 2.0 * np.sin(step / 2.0)
+        self.assertLessEqual(np.abs(np.diff(audio)).max(), max_jump + 2)
+
+    def test_audio_callback_fills_bytes(self):
+        self.gen.key_down()
+        stream = bytearray(2 * 128)
+        self.gen.audio_callback(None, stream)
+        self.assertTrue(any(stream))
+
+
+class TestPileUpMixer(unittest.TestCase):
+    def _peak_frequencies(self, audio, sample_rate, count):
+        spectrum = np.abs(np.fft.rfft(audio.astype(np.float64)))
+        freqs = np.fft.rfftfreq(len(audio), 1.0 / sample_rate)
+        peaks = []
+        for i in np.argsort(spectrum)[::-1]:
+            if all(abs(freqs[i] - p) > 50 for p in peaks):
+                peaks.append(freqs[i])
+            if len(peaks) == count:
+                return sorted(peaks)
+
+    def test_single_station_matches_timeline(self):
+        station = Station("SOS", wpm=20, amplitude=0.9)
+        mixer = PileUpMixer([station], sample_rate=8000, block_seconds=0.1, seed=1)
+        audio = mixer.render()
+        unit = int(8000 * unit_seconds(20))
+        self.assertEqual(len(audio), sum(u for _, u in morse_timeline("... --- ...")) * unit + mixer._rise)
+        keyed = np.flatnonzero(np.abs(audio) > 100)
+        self.assertLess(keyed[0], unit // 4)
+        self.assertFalse(np.abs(audio[unit + unit // 4:2 * unit - unit // 4]).max() > 0)
+
+    def test_stations_keep_their_pitch(self):
+        stations = [Station("TEST", frequency=f, wpm=25, amplitude=0.3, start=i * 0.05)
+                    for i, f in enumerate((500, 800, 1100))]
+        audio = PileUpMixer(stations, sample_rate=8000, seed=2).render()
+        for found, expected in zip(self._peak_frequencies(audio, 8000, 3), (500, 800, 1100)):
+            self.assertAlmostEqual(found, expected, delta=10)
+
+    def test_noise_and_qsb(self):
+        quiet = PileUpMixer([Station("E")], sample_rate=8000, seed=3).render(duration=1.0)
+        noisy = PileUpMixer([Station("E")], sample_rate=8000, noise_level=0.1, seed=3).render(duration=1.0)
+        self.assertEqual(len(noisy), 8000)
+        self.assertFalse(quiet[-1000:].any())
+        self.assertTrue(noisy[-1000:].any())
+        faded = PileUpMixer([Station("T" * 20, qsb_depth=1.0, qsb_rate=1.0)], sample_rate=8000, seed=4).render()
+        self.assertGreater(np.abs(faded).max(), 8000)
+
+    def test_silent_stations_send_no_carrier(self):
+        silent = [Station(""), Station("π"), Station(code="/")]
+        for station in silent:
+            self.assertEqual(len(station.transitions(8000)), 0)
+        self.assertFalse(PileUpMixer(silent, sample_rate=8000, seed=6).render(duration=0.5).any())
+
+        alone = PileUpMixer([Station("E", frequency=600)], sample_rate=8000, seed=6)
+        mixed = PileUpMixer([Station("E", frequency=600), Station("", frequency=1000)], sample_rate=8000, seed=6)
+        self.assertEqual(mixed.length, alone.length)
+        spectrum = np.abs(np.fft.rfft(mixed.render().astype(np.float64)))
+        freqs = np.fft.rfftfreq(mixed.length, 1.0 / 8000)
+        self.assertLess(spectrum[np.abs(freqs - 1000) < 20].max(), spectrum.max() / 100)
+
+    def test_write_wav(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "pileup.wav")
+            mixer = PileUpMixer([Station("CQ"), Station("DE", frequency=600)], sample_rate=8000, seed=5)
+            mixer.write_wav(path)
+            with wave.open(path) as wav:
+                self.assertEqual(wav.getnframes(), mixer.length)
+
+
+class TestSkimmer(unittest.TestCase):
+    def test_runs_to_code(self):
+        runs = [(False, 9), (True, 4), (False, 4), (True, 12), (False, 12), (True, 4), (False, 28), (True, 12), (False, 9)]
+        self.assertEqual(runs_to_code(runs), ".- . / -")
+        self.assertEqual(runs_to_code([(False, 5)]), "")
+
+    def test_keying_runs(self):
+        self.assertEqual(keying_runs([False, True, True, False]), [(False, 1), (True, 2), (False, 1)])
+
+    def test_skims_several_stations(self):
+        messages = {500: "CQ TEST", 900: "DE ORACLE", 1300: "SOS SOS"}
+        stations = [Station(text, frequency=f, wpm=w, amplitude=0.25)
+                    for (f, text), w in zip(messages.items(), (18, 24, 30))]
+        audio = PileUpMixer(stations, sample_rate=8000, noise_level=0.02, seed=7).render()
+        transcripts = list(skim(audio, 8000))
+        self.assertEqual(len(transcripts), 3)
+        for transcript, (frequency, text) in zip(transcripts, messages.items()):
+            self.assertAlmostEqual(transcript.frequency, frequency, delta=SKIM_BIN_WIDTH)
+            self.assertEqual(transcript.text, text)
+
+    def test_resolution_independent_of_sample_rate(self):
+        messages = {600: "CQ CQ", 800: "DE TEST", 1000: "QRZ K"}
+        for sample_rate in (8000, 44100):
+            stations = [Station(text, frequency=f, wpm=22, amplitude=0.25, start=i * 0.1)
+                        for i, (f, text) in enumerate(messages.items())]
+            audio = PileUpMixer(stations, sample_rate=sample_rate, noise_level=0.02, seed=9).render()
+            transcripts = list(skim(audio, sample_rate))
+            self.assertEqual([t.text for t in transcripts], list(messages.values()), sample_rate)
+            for transcript, frequency in zip(transcripts, messages):
+                self.assertAlmostEqual(transcript.frequency, frequency, delta=SKIM_BIN_WIDTH)
+
+    def test_strong_station_splatter_is_not_a_channel(self):
+        audio = PileUpMixer([Station("CQ CQ DE TEST", wpm=22, amplitude=0.8)], sample_rate=44100,
+                            noise_level=0.01, seed=3).render()
+        self.assertEqual([t.text for t in skim(audio, 44100)], ["CQ CQ DE TEST"])
+
+    def test_silence(self):
+        self.assertEqual(list(skim(np.zeros(8000, dtype=np.int16), 8000)), [])
+
+
+class TestParallelDecoding(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "long.wav")
+        self.message = " ".join(["THE ORACLE SPEAKS"] * 8)
+        mixer = PileUpMixer([Station(self.message, wpm=25, amplitude=0.5)], sample_rate=8000,
+                            noise_level=0.01, seed=8)
+        mixer.write_wav(self.path)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_memory_mapped_samples(self):
+        samples, sample_rate = open_wav_samples(self.path)
+        self.assertIsInstance(samples, np.memmap)
+        self.assertEqual((samples.shape[1], sample_rate), (1, 8000))
+
+    def test_cuts_fall_in_silence(self):
+        samples, sample_rate = open_wav_samples(self.path)
+        cuts = find_silence_cuts(samples, sample_rate, segment_seconds=3.0)
+        self.assertGreater(len(cuts), 2)
+        for cut in cuts:
+            self.assertLess(np.abs(samples[cut - 800:cut + 800].astype(np.int32)).max(), 2000)
+
+    def test_pooled_scan_matches_serial(self):
+        samples, sample_rate = open_wav_samples(self.path)
+        bins, envelopes, _, _ = scan_channels(samples, sample_rate)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            pooled_bins, pooled_envelopes, _, _ = scan_channels(samples, sample_rate, pool=pool, path=self.path)
+            self.assertEqual(find_silence_cuts(samples, sample_rate, 3.0, pool=pool, path=self.path),
+                             find_silence_cuts(samples, sample_rate, 3.0))
+        self.assertEqual(list(pooled_bins), list(bins))
+        np.testing.assert_array_equal(pooled_envelopes, envelopes)
+
+    def test_chunks_tile_the_frames(self):
+        samples, sample_rate = open_wav_samples(self.path)
+        _, envelopes, _, _ = scan_channels(samples, sample_rate)
+        with patch(f"{__name__}.SCAN_CHUNK_FRAMES", 500):
+            _, chunked, _, _ = scan_channels(samples, sample_rate)
+        np.testing.assert_allclose(chunked, envelopes, rtol=1e-5)
+
+    def test_weak_station_is_never_cut(self):
+        path = os.path.join(self.folder.name, "pileup.wav")
+        messages = {600: " ".join(["CQ CQ DE TEST"] * 4), 1400: " ".join(["QRZ DE ORACLE K"] * 3)}
+        stations = [Station(messages[600], frequency=600, wpm=25, amplitude=0.8),
+                    Station(messages[1400], frequency=1400, wpm=20, amplitude=0.15, start=0.7)]
+        PileUpMixer(stations, sample_rate=8000, noise_level=0.01, seed=10).write_wav(path)
+
+        samples, sample_rate = open_wav_samples(path)
+        weak = PileUpMixer(stations[1:], sample_rate=8000, seed=10).render()
+        for cut in find_silence_cuts(samples, sample_rate, segment_seconds=3.0):
+            self.assertFalse(np.abs(weak[cut - 200:cut + 200]).max() > 100)
+        transcripts = decode_wav_file(path, workers=2, segment_seconds=3.0)
+        self.assertEqual([t.text for t in transcripts], list(messages.values()))
+        for transcript, frequency in zip(transcripts, messages):
+            self.assertAlmostEqual(transcript.frequency, frequency, delta=SKIM_BIN_WIDTH)
+
+    def test_parallel_decode_matches_message(self):
+        transcripts = decode_wav_file(self.path, workers=2, segment_seconds=3.0)
+        self.assertEqual(len(transcripts), 1)
+        self.assertEqual(transcripts[0].text, self.message)
+        self.assertAlmostEqual(transcripts[0].frequency, DEFAULT_FREQUENCY, delta=SKIM_BIN_WIDTH)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,432 @@
+import asyncio
+import argparse
+import json
+import math
+import sys
+import unittest
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+from morse_core import (
+    DEFAULT_WPM, letters_to_morse, morse_to_letters, morse_timeline, render_wav, unit_seconds
+)
+
+# --- Constants ---
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1 << 20
+MAX_HEADERS = 100
+QUEUE_SIZE = 1024
+BATCH_SIZE = 64
+BATCH_DELAY = 0.002  # seconds to wait for more requests to join a batch
+CACHE_SIZE = 4096
+IDLE_TIMEOUT = 15.0  # seconds a keep-alive connection may wait for its next request
+REQUEST_TIMEOUT = 10.0  # seconds allowed to send the rest of a request once it starts
+CACHE_BYTES = 64 << 20  # the cache also stays under this many bytes of results
+MIN_WPM = 1
+MAX_WPM = 100
+MAX_WAV_SECONDS = 300
+
+HTTP_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    408: "Request Timeout", 413: "Payload Too Large", 414: "URI Too Long",
+    431: "Request Header Fields Too Large", 500: "Internal Server Error"
+}
+
+
+# --- Operations ---
+def _encode(payload, table, wpm):
+    return letters_to_morse(payload, table)
+
+def _decode(payload, table, wpm):
+    return morse_to_letters(payload, table)
+
+def _render(payload, table, wpm):
+    seconds = sum(units for _, units in morse_timeline(payload)) * unit_seconds(wpm)
+    if seconds > MAX_WAV_SECONDS:
+        raise ServiceError(413, f"Recording would last {seconds:.0f} s; the limit is {MAX_WAV_SECONDS} s")
+    return render_wav(payload, wpm)
+
+# name -> (function, request field, response content type)
+OPERATIONS = {
+    "encode": (_encode, "text", "application/json"),
+    "decode": (_decode, "code", "application/json"),
+    "wav": (_render, "code", "audio/wav"),
+}
+
+
+class ServiceError(Exception):
+    """A request the service refuses, carrying the HTTP status to send"""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# --- Batching Translation Service ---
+class TranslationService:
+    """Micro-batches translation requests behind a bounded queue and an LRU cache"""
+    def __init__(self, batch_size=BATCH_SIZE, batch_delay=BATCH_DELAY,
+                 queue_size=QUEUE_SIZE, cache_size=CACHE_SIZE, cache_bytes=CACHE_BYTES):
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self.cache = OrderedDict()
+        self.cached_bytes = 0
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.batches_run = 0
+        self._worker = None
+
+    async def start(self):
+        self._worker = asyncio.create_task(self._batch_loop())
+
+    async def stop(self):
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, operation, payload, table=None, wpm=DEFAULT_WPM):
+        """Translate one payload, waiting for queue space when the service is saturated"""
+        key = (operation, payload, table, wpm)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((key, future))  # blocks callers while the queue is full
+        return await future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            if self.queue.qsize() < self.batch_size:
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            waiting = {}
+            for key, future in batch:
+                waiting.setdefault(key, []).append(future)
+
+            results = await loop.run_in_executor(None, self._run_batch, list(waiting))
+            self.batches_run += 1
+
+            for key, futures in waiting.items():
+                result = results[key]
+                if not isinstance(result, Exception):
+                    self._remember(key, result)
+                for future in futures:
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            for _ in batch:
+                self.queue.task_done()
+
+    def _run_batch(self, keys):
+        """Run each distinct request of a batch through the core functions"""
+        results = {}
+        for key in keys:
+            operation, payload, table, wpm = key
+            try:
+                results[key] = OPERATIONS[operation][0](payload, table, wpm)
+            except ServiceError as e:
+                results[key] = e
+            except KeyError as e:
+                results[key] = ServiceError(400, str(e).strip('"'))
+            except Exception as e:
+                results[key] = ServiceError(500, str(e))
+        return results
+
+    def _remember(self, key, result):
+        size = len(result)
+        if size > self.cache_bytes:
+            return
+        if key in self.cache:
+            self.cached_bytes -= len(self.cache[key])
+        self.cache[key] = result
+        self.cache.move_to_end(key)
+        self.cached_bytes += size
+        while len(self.cache) > self.cache_size or self.cached_bytes > self.cache_bytes:
+            _, evicted = self.cache.popitem(last=False)
+            self.cached_bytes -= len(evicted)
+
+
+# --- HTTP Front End ---
+class TranslationServer:
+    """Minimal HTTP/1.1 front end for TranslationService
+
+    ``POST /encode`` takes ``{"text": ...}``, ``POST /decode`` and
+    ``POST /wav`` take ``{"code": ...}``; all accept optional ``table`` and
+    ``wpm`` fields. The same fields work as a GET query string.
+    Idle keep-alive connections are closed after ``idle_timeout``; a
+    request that stalls part way is answered 408 after ``request_timeout``.
+    """
+    def __init__(self, service, idle_timeout=IDLE_TIMEOUT, request_timeout=REQUEST_TIMEOUT):
+        self.service = service
+        self.idle_timeout = idle_timeout
+        self.request_timeout = request_timeout
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except ServiceError as e:
+                    await self._respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, body, keep_alive = request
+                try:
+                    status, content_type, content = await self._dispatch(method, target, body)
+                except ServiceError as e:
+                    status, content_type, content = e.status, "application/json", {"error": str(e)}
+                except Exception as e:  # never drop the connection without an answer
+                    status, content_type, content = 500, "application/json", {"error": str(e)}
+                await self._respond(writer, status, content, content_type, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_line(self, reader, status, message):
+        """One CRLF-terminated line; lines over the stream limit become ``status``"""
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise ServiceError(status, message)
+
+    async def _read_request(self, reader):
+        try:
+            line = await asyncio.wait_for(
+                self._read_line(reader, 414, "Request line too long"), self.idle_timeout)
+        except asyncio.TimeoutError:
+            return None  # idle keep-alive connection
+        if not line:
+            return None
+        try:
+            return await asyncio.wait_for(self._read_rest(reader, line), self.request_timeout)
+        except asyncio.TimeoutError:
+            raise ServiceError(408, "Request not received in time")
+
+    async def _read_rest(self, reader, line):
+        try:
+            method, target, http_version = line.decode('latin-1').split()
+        except ValueError:
+            raise ServiceError(400, "Malformed request line")
+
+        headers = {}
+        for _ in range(MAX_HEADERS):
+            line = await self._read_line(reader, 431, "Header line too long")
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise ServiceError(400, "Too many headers")
+
+        length = headers.get("content-length", "0").strip() or "0"
+        if not (length.isascii() and length.isdigit()):
+            raise ServiceError(400, "Content-Length must be a non-negative integer")
+        length = int(length)
+        if length > MAX_BODY_BYTES:
+            raise ServiceError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b''
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if http_version == "HTTP/1.1" else connection == "keep-alive"
+        return method, target, body, keep_alive
+
+    async def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, "application/json", {"status": "ok", "batches": self.service.batches_run}
+
+        operation = url.path.strip('/')
+        if operation not in OPERATIONS:
+            raise ServiceError(404, f"Unknown path: {url.path}")
+        if method == "POST":
+            try:
+                fields = json.loads(body or b'{}')
+            except ValueError:
+                raise ServiceError(400, "Body must be JSON")
+            if not isinstance(fields, dict):
+                raise ServiceError(400, "Body must be a JSON object")
+        elif method == "GET":
+            fields = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        else:
+            raise ServiceError(405, f"Unsupported method: {method}")
+
+        _, field, content_type = OPERATIONS[operation]
+        payload = fields.get(field)
+        if not isinstance(payload, str):
+            raise ServiceError(400, f"Missing '{field}' field")
+        table = fields.get("table")
+        if table is not None and not isinstance(table, str):
+            raise ServiceError(400, "table must be a string")
+        wpm = fields.get("wpm", DEFAULT_WPM)
+        try:
+            if isinstance(wpm, bool):
+                raise TypeError
+            wpm = float(wpm)
+        except (TypeError, ValueError):
+            raise ServiceError(400, "wpm must be a number")
+        if not (math.isfinite(wpm) and MIN_WPM <= wpm <= MAX_WPM):
+            raise ServiceError(400, f"wpm must be between {MIN_WPM} and {MAX_WPM}")
+
+        result = await self.service.submit(operation, payload, table, wpm)
+        if content_type == "application/json":
+            result = {"result": result}
+        return 200, content_type, result
+
+    async def _respond(self, writer, status, content, content_type="application/json", keep_alive=True):
+        if content_type == "application/json":
+            content = json.dumps(content, ensure_ascii=False).encode('utf-8')
+            content_type += "; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(content)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + content)
+        await writer.drain()
+
+
+async def start_server(host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None,
+                       idle_timeout=IDLE_TIMEOUT, request_timeout=REQUEST_TIMEOUT, **service_options):
+    """Start the translation service; returns (asyncio server, TranslationService)"""
+    service = TranslationService(**service_options)
+    await service.start()
+    front_end = TranslationServer(service, idle_timeout, request_timeout)
+    if unix_path:
+        server = await asyncio.start_unix_server(front_end.handle, unix_path, backlog=4096)
+    else:
+        server = await asyncio.start_server(front_end.handle, host, port, backlog=4096)
+    return server, service
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+    server, service = await start_server(host, port, unix_path)
+    print(f"Oracle listening on {unix_path or f'http://{host}:{port}'}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+# --- Unit Tests ---
+class TestTranslationServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server, self.service = await start_server(port=0, idle_timeout=0.5, request_timeout=0.3)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.service.stop()
+
+    async def _request(self, method, path, fields=None, length=None):
+        reader, writer = await asyncio.open_connection(DEFAULT_HOST, self.port)
+        body = json.dumps(fields).encode('utf-8') if fields is not None else b''
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Length: {len(body) if length is None else length}\r\n"
+            f"Connection: close\r\n\r\n".encode('latin-1') + body
+        )
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, content = response.partition(b'\r\n\r\n')
+        return int(head.split()[1]), content
+
+    async def test_encode_and_decode(self):
+        status, content = await self._request("POST", "/encode", {"text": "SOS"})
+        self.assertEqual((status, json.loads(content)), (200, {"result": "... --- ..."}))
+        status, content = await self._request("GET", "/decode?code=...%20---%20...")
+        self.assertEqual(json.loads(content), {"result": "SOS"})
+
+    async def test_wav(self):
+        status, content = await self._request("POST", "/wav", {"code": ".-", "wpm": 30})
+        self.assertEqual(status, 200)
+        self.assertTrue(content.startswith(b'RIFF'))
+
+    async def test_errors(self):
+        self.assertEqual((await self._request("POST", "/nowhere", {}))[0], 404)
+        self.assertEqual((await self._request("POST", "/encode", {}))[0], 400)
+        self.assertEqual((await self._request("POST", "/encode", {"text": "A", "table": "Klingon"}))[0], 400)
+
+    async def test_bad_fields_are_rejected(self):
+        for fields in ({"text": "A", "table": ["ITU"]}, {"text": "A", "table": {"x": 1}},
+                       {"text": "A", "wpm": "nan"}, {"text": "A", "wpm": True},
+                       {"text": "A", "wpm": 1e-4}, {"text": "A", "wpm": 1e6}):
+            self.assertEqual((await self._request("POST", "/encode", fields))[0], 400, fields)
+        self.assertEqual((await self._request("GET", "/encode?text=A&wpm=nan"))[0], 400)
+        for length in ("abc", "-3"):
+            self.assertEqual((await self._request("POST", "/encode", {"text": "A"}, length))[0], 400)
+
+    async def _raw(self, data):
+        reader, writer = await asyncio.open_connection(DEFAULT_HOST, self.port)
+        writer.write(data)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5.0)
+        writer.close()
+        return response
+
+    async def test_overlong_lines_answered(self):
+        response = await self._raw(b"GET /" + b"a" * 70000 + b" HTTP/1.1\r\n\r\n")
+        self.assertTrue(response.startswith(b"HTTP/1.1 414"))
+        response = await self._raw(b"GET /health HTTP/1.1\r\nX-Big: " + b"a" * 70000 + b"\r\n\r\n")
+        self.assertTrue(response.startswith(b"HTTP/1.1 431"))
+
+    async def test_stalled_and_idle_connections_time_out(self):
+        response = await self._raw(b"POST /encode HTTP/1.1\r\nContent-Length: 100\r\n\r\n{}")
+        self.assertTrue(response.startswith(b"HTTP/1.1 408"))
+        self.assertEqual(await self._raw(b""), b"")  # idle connection closed after idle_timeout
+
+    async def test_long_wav_refused(self):
+        status, content = await self._request("POST", "/wav", {"code": "-" * 2000, "wpm": MIN_WPM})
+        self.assertEqual(status, 413)
+        self.assertIn("limit", json.loads(content)["error"])
+
+    def test_cache_bounded_by_bytes(self):
+        service = TranslationService(cache_bytes=100)
+        for i in range(10):
+            service._remember(("wav", str(i), None, 12), b'x' * 30)
+        self.assertEqual((len(service.cache), service.cached_bytes), (3, 90))
+        service._remember(("wav", "big", None, 12), b'x' * 101)
+        self.assertNotIn(("wav", "big", None, 12), service.cache)
+
+    async def test_concurrent_requests_are_batched_and_cached(self):
+        texts = [f"ORACLE {i % 10}" for i in range(200)]
+        responses = await asyncio.gather(*(self._request("POST", "/encode", {"text": t}) for t in texts))
+        for text, (status, content) in zip(texts, responses):
+            self.assertEqual(json.loads(content)["result"], letters_to_morse(text))
+        self.assertLess(self.service.batches_run, len(texts))
+
+        batches = self.service.batches_run
+        await self._request("POST", "/encode", {"text": "ORACLE 3"})
+        self.assertEqual(self.service.batches_run, batches)
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Morse translation service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        sys.exit(0)